@@ -6,43 +6,119 @@ Usage:
     python cli.py run --project-id <project-id>
 """
 
+import functools
+import io
+import os
+import re
 import sys
 import argparse
+import traceback
 import json
 import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 from pathlib import Path
-from src.agent.graph import get_campaign_agent
-from src.agent.state import create_initial_state
-from src.database.persistence import SessionPersistence, ProjectPersistence
-from src.utils.progress import get_progress_tracker
+from string import Template
+from types import SimpleNamespace
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
 
-def is_valid_uuid(value):
+# Section rules used throughout the CLI output
+RULE = "=" * 60
+THIN_RULE = "─" * 60
+
+# Maximum number of list items joined onto a single report line
+MAX_JOINED_ITEMS = 10
+
+# Maximum length of free-text LLM fields (rationales, analyses) in reports
+MAX_TEXT_FIELD_CHARS = 500
+
+# Knowledge-graph confidence bars for 0..10 filled blocks, padded to 10 chars
+CONFIDENCE_BARS = tuple(("█" * i).ljust(10) for i in range(11))
+
+# Creative rating bars for 0..10 category scores (filled + empty blocks)
+SCORE_BARS = tuple("█" * i + "░" * (10 - i) for i in range(11))
+
+# Notices for unfinished previous flows: flow_status -> (title, resume note)
+FLOW_STATUS_NOTICES = {
+    "in_progress": ("INCOMPLETE FLOW DETECTED", "✓ Will resume from last checkpoint"),
+    "failed": ("PREVIOUS FLOW FAILED", "✓ Will retry from failed point"),
+}
+
+# Translation table that deletes every character allowed in a canonical UUID
+UUID_CHARS_DELETE = str.maketrans("", "", "0123456789abcdefABCDEF-")
+
+# Lengths of the non-canonical UUID spellings: bare hex, {braced} and
+# urn:uuid: prefixed, each with or without hyphens
+UUID_ALT_LENGTHS = frozenset((32, 34, 38, 41, 45))
+
+# Separator for comma-separated CLI inputs, absorbing surrounding whitespace
+LIST_SEPARATOR_RE = re.compile(r"\s*,\s*")
+
+# Input prefixes treated as product URLs rather than local file paths
+URL_SCHEMES = ("http://", "https://")
+
+# Maximum number of files uploaded to storage concurrently
+MAX_UPLOAD_WORKERS = 8
+
+# Session state fields included in `run --json` output
+RESULT_JSON_FIELDS = (
+    "project_id", "session_num", "decision", "current_phase", "iteration",
+    "flow_status", "errors", "current_config", "current_strategy", "experiment_plan",
+)
+
+# Buffer size for text files written by the CLI, so the many small writes
+# from json.dump and the checklist writer are coalesced into a few large ones
+FILE_WRITE_BUFFER = 1 << 16
+
+
+def _is_uuid(value):
     """Check if a string is a valid UUID"""
-    try:
-        uuid.UUID(value)
-        return True
-    except (ValueError, AttributeError):
+    if not isinstance(value, str):
         return False
 
+    # Fast path: canonical 8-4-4-4-12 form, checked without building a UUID
+    if len(value) == 36:
+        return (not value.translate(UUID_CHARS_DELETE)
+                and value[8] == value[13] == value[18] == value[23] == "-"
+                and value.count("-") == 4)
 
-def get_or_create_project(project_identifier):
+    # Other spellings uuid.UUID accepts (bare hex, braces, urn:uuid: prefix)
+    if len(value) in UUID_ALT_LENGTHS:
+        try:
+            uuid.UUID(value)
+            return True
+        except ValueError:
+            return False
+
+    return False
+
+
+def get_or_create_project(project_identifier, is_uuid):
     """
     Get existing project or create new one
 
     Args:
         project_identifier: Either a UUID or a project name
+        is_uuid: Result of _is_uuid(project_identifier)
 
     Returns:
-        project_id: UUID of the project
+        Tuple of (project_id, project) where project is the loaded project
+        record for an existing UUID, or None for a newly created project
     """
+    from src.database.persistence import ProjectPersistence
+
     # Check if it's already a valid UUID
-    if is_valid_uuid(project_identifier):
+    if is_uuid:
         # Verify it exists
         project = ProjectPersistence.load_project(project_identifier)
         if project:
             print(f"✓ Using existing project: {project.get('project_name', 'Unnamed')}")
-            return project_identifier
+            return project_identifier, project
         else:
             print(f"Error: Project UUID {project_identifier} not found")
             sys.exit(1)
@@ -56,171 +132,238 @@ def get_or_create_project(project_identifier):
         target_budget=1000.0  # Default budget
     )
     print(f"✓ Created project with ID: {project_id}")
-    return project_id
+    return project_id, None
+
+
+def _trunc(s, n):
+    """Truncate s to at most n characters, ending with '...' when cut"""
+    return s if len(s) <= n else s[:n - 3] + "..."
+
+
+def _score_bar(score):
+    """Bar for a 0..10 category score, built directly when out of range"""
+    if 0 <= score <= 10:
+        return SCORE_BARS[score]
+    return "█" * score + "░" * (10 - score)
+
+
+def _cap_text(value):
+    """Render a free-text report field, truncated to MAX_TEXT_FIELD_CHARS"""
+    return _trunc(value if isinstance(value, str) else str(value), MAX_TEXT_FIELD_CHARS)
+
+
+def _join_capped(items, limit=MAX_JOINED_ITEMS):
+    """Join the first limit items with ', ', noting how many were left out"""
+    joined = ", ".join(map(str, islice(items, limit)))
+    if len(items) > limit:
+        joined += f" (+{len(items) - limit} more)"
+    return joined
+
+
+def _format_budget_share(pct):
+    """Format a budget_split fraction (number or numeric string) as a percentage"""
+    try:
+        pct_num = float(pct) if isinstance(pct, str) else pct
+        return f"{int(pct_num * 100)}%"
+    except (ValueError, TypeError):
+        return str(pct)
+
+
+def _write_bytes(path, payload):
+    """Write an in-memory payload straight to a file descriptor"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _write_json(path, data):
+    """Write data to path as indented JSON, using orjson when available"""
+    if orjson is not None:
+        try:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Types orjson can't encode; let the stdlib encoder report them
+            pass
+        else:
+            _write_bytes(path, payload)
+            return
+
+    with open(path, "w", buffering=FILE_WRITE_BUFFER) as f:
+        json.dump(data, f, indent=2)
+
+
+def _emit(out):
+    """Write a buffered report to stdout in a single call"""
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
 
 
 def print_banner():
     """Print CLI banner"""
-    print("=" * 60)
+    print(RULE)
     print("  Campaign Setup Agent - Intelligent Optimization")
-    print("=" * 60)
+    print(RULE)
     print()
 
 
-def print_strategy_details(strategy):
+def _write_joined_field(label, value, out, limit=MAX_JOINED_ITEMS):
+    """Write a strategy field on one line, joining it when it is a list"""
+    if isinstance(value, list):
+        value = _join_capped(value, limit)
+    print(f"  {label}: {value}", file=out)
+
+
+def _write_bulleted_field(label, value, out, limit=3):
+    """Write a strategy field as up to limit bullets, or inline when not a list"""
+    if isinstance(value, list):
+        print(f"  {label}:", file=out)
+        out.writelines(f"    • {item}\n" for item in islice(value, limit))
+    else:
+        print(f"  {label}: {value}", file=out)
+
+
+def print_strategy_details(strategy, out):
     """
     Print detailed strategy breakdown showing insights → strategy mapping
 
     Args:
         strategy: Strategy dictionary from current_strategy
+        out: Text buffer to write into
     """
-    if not strategy:
-        return
-
-    print("\n" + "=" * 60)
-    print("  STRATEGY BREAKDOWN")
-    print("=" * 60)
+    print("\n" + RULE, file=out)
+    print("  STRATEGY BREAKDOWN", file=out)
+    print(RULE, file=out)
 
     # Insights
     insights = strategy.get("insights", {})
     if insights:
-        print("\n📊 KEY INSIGHTS:")
-        if insights.get("patterns"):
-            print("\n  Patterns Identified:")
-            for pattern in insights["patterns"]:
-                print(f"    • {pattern}")
-
-        if insights.get("strengths"):
-            print("\n  Strengths:")
-            for strength in insights["strengths"]:
-                print(f"    ✓ {strength}")
-
-        if insights.get("weaknesses"):
-            print("\n  Weaknesses:")
-            for weakness in insights["weaknesses"]:
-                print(f"    ⚠ {weakness}")
-
-        if insights.get("benchmark_comparison"):
-            print(f"\n  Benchmark Comparison:")
-            print(f"    {insights['benchmark_comparison']}")
+        print("\n📊 KEY INSIGHTS:", file=out)
+        patterns = insights.get("patterns")
+        if patterns:
+            print("\n  Patterns Identified:", file=out)
+            for pattern in patterns:
+                print(f"    • {pattern}", file=out)
+
+        strengths = insights.get("strengths")
+        if strengths:
+            print("\n  Strengths:", file=out)
+            for strength in strengths:
+                print(f"    ✓ {strength}", file=out)
+
+        weaknesses = insights.get("weaknesses")
+        if weaknesses:
+            print("\n  Weaknesses:", file=out)
+            for weakness in weaknesses:
+                print(f"    ⚠ {weakness}", file=out)
+
+        benchmark = insights.get("benchmark_comparison")
+        if benchmark:
+            print(f"\n  Benchmark Comparison:", file=out)
+            print(f"    {_cap_text(benchmark)}", file=out)
 
     # Target Audience
     audience = strategy.get("target_audience", {})
     if audience:
-        print("\n🎯 TARGET AUDIENCE:")
-        if audience.get("primary_segments"):
-            segments = audience['primary_segments']
-            if isinstance(segments, list):
-                print(f"  Segments: {', '.join(segments)}")
-            else:
-                print(f"  Segments: {segments}")
-        if audience.get("demographics"):
-            demo = audience["demographics"]
+        print("\n🎯 TARGET AUDIENCE:", file=out)
+        segments = audience.get("primary_segments")
+        if segments:
+            _write_joined_field("Segments", segments, out)
+        demo = audience.get("demographics")
+        if demo:
             if isinstance(demo, dict):
-                print(f"  Demographics: {demo.get('age', 'N/A')} | {demo.get('gender', 'N/A')} | {demo.get('location', 'N/A')}")
-            else:
-                print(f"  Demographics: {demo}")
-        if audience.get("interests"):
-            interests = audience['interests']
-            if isinstance(interests, list):
-                interests = interests[:5]  # First 5
-                print(f"  Key Interests: {', '.join(interests)}")
+                print(f"  Demographics: {demo.get('age', 'N/A')} | {demo.get('gender', 'N/A')} | {demo.get('location', 'N/A')}", file=out)
             else:
-                print(f"  Key Interests: {interests}")
+                print(f"  Demographics: {demo}", file=out)
+        interests = audience.get("interests")
+        if interests:
+            _write_joined_field("Key Interests", interests, out, limit=5)
 
     # Creative Strategy
     creative = strategy.get("creative_strategy", {})
     if creative:
-        print("\n🎨 CREATIVE STRATEGY:")
-        if creative.get("messaging_angles"):
-            angles = creative["messaging_angles"]
-            if isinstance(angles, list):
-                print("  Messaging Angles:")
-                for angle in angles[:3]:
-                    print(f"    • {angle}")
-            else:
-                print(f"  Messaging Angles: {angles}")
-        if creative.get("value_props"):
-            props = creative["value_props"]
-            if isinstance(props, list):
-                print("  Value Propositions:")
-                for prop in props[:3]:
-                    print(f"    • {prop}")
-            else:
-                print(f"  Value Propositions: {props}")
+        print("\n🎨 CREATIVE STRATEGY:", file=out)
+        angles = creative.get("messaging_angles")
+        if angles:
+            _write_bulleted_field("Messaging Angles", angles, out)
+        props = creative.get("value_props")
+        if props:
+            _write_bulleted_field("Value Propositions", props, out)
 
     # Platform Strategy
     platform = strategy.get("platform_strategy", {})
     if platform:
-        print("\n📱 PLATFORM STRATEGY:")
-        if platform.get("priorities"):
-            priorities = platform['priorities']
-            if isinstance(priorities, list):
-                print(f"  Priority Platforms: {', '.join(priorities)}")
-            else:
-                print(f"  Priority Platforms: {priorities}")
-        if platform.get("budget_split"):
-            budget_split = platform["budget_split"]
+        print("\n📱 PLATFORM STRATEGY:", file=out)
+        priorities = platform.get("priorities")
+        if priorities:
+            _write_joined_field("Priority Platforms", priorities, out)
+        budget_split = platform.get("budget_split")
+        if budget_split:
             if isinstance(budget_split, dict):
-                print("  Budget Allocation:")
-                for plat, pct in budget_split.items():
-                    # Handle both numeric and string percentages
-                    try:
-                        pct_num = float(pct) if isinstance(pct, str) else pct
-                        print(f"    {plat}: {int(pct_num * 100)}%")
-                    except (ValueError, TypeError):
-                        print(f"    {plat}: {pct}")
+                print("  Budget Allocation:", file=out)
+                # Handle both numeric and string percentages
+                print("\n".join(
+                    f"    {plat}: {_format_budget_share(pct)}"
+                    for plat, pct in budget_split.items()
+                ), file=out)
             else:
-                print(f"  Budget Allocation: {budget_split}")
-        if platform.get("rationale"):
-            print(f"  Rationale: {platform['rationale']}")
+                print(f"  Budget Allocation: {budget_split}", file=out)
+        platform_rationale = platform.get("rationale")
+        if platform_rationale:
+            print(f"  Rationale: {_cap_text(platform_rationale)}", file=out)
 
-    print()
+    print(file=out)
 
 
-def print_experiment_plan(experiment_plan):
+def print_experiment_plan(experiment_plan, out):
     """
     Print execution timeline plan
 
     Args:
         experiment_plan: Execution timeline dictionary
+        out: Text buffer to write into
     """
-    if not experiment_plan:
-        return
-
     # Check if this is the new execution timeline format
     if "timeline" in experiment_plan:
-        print_execution_timeline(experiment_plan)
+        print_execution_timeline(experiment_plan, out)
     else:
         # Fallback for old format (shouldn't happen but safe)
-        print("\n⚠ Legacy experiment plan format detected")
-        print(json.dumps(experiment_plan, indent=2))
+        print("\n⚠ Legacy experiment plan format detected", file=out)
+        print(json.dumps(experiment_plan, indent=2), file=out)
 
 
-def print_execution_timeline(execution_plan):
-    """Print flexible execution timeline plan"""
+def print_execution_timeline(execution_plan, out):
+    """Print flexible execution timeline plan into out"""
     timeline = execution_plan.get("timeline", {})
 
     if not timeline:
-        print("\n⚠ No timeline data available")
+        print("\n⚠ No timeline data available", file=out)
         return
 
     total_days = timeline.get("total_duration_days", 0)
     phases = timeline.get("phases", [])
     checkpoints = timeline.get("checkpoints", [])
 
-    print("\n" + "=" * 60)
-    print(f"  EXECUTION TIMELINE ({total_days} DAYS)")
-    print("=" * 60)
+    print("\n" + RULE, file=out)
+    print(f"  EXECUTION TIMELINE ({total_days} DAYS)", file=out)
+    print(RULE, file=out)
 
     # Print reasoning
-    if timeline.get("reasoning"):
-        print(f"\n💡 Timeline Design:")
-        print(f"  {timeline['reasoning']}")
+    reasoning = timeline.get("reasoning")
+    if reasoning:
+        print(f"\n💡 Timeline Design:", file=out)
+        print(f"  {_cap_text(reasoning)}", file=out)
 
     # Print phases
-    print(f"\n📅 TESTING PHASES ({len(phases)} phases):")
-    print("─" * 60)
+    print(f"\n📅 TESTING PHASES ({len(phases)} phases):", file=out)
+    print(THIN_RULE, file=out)
+
+    # Creative briefs are tallied during the phase pass for the summary below
+    total_creatives = 0
+    platforms_with_creatives = set()
 
     for i, phase in enumerate(phases, 1):
         phase_name = phase.get("name", f"Phase {i}")
@@ -229,97 +372,104 @@ def print_execution_timeline(execution_plan):
         end = phase.get("end_day", 0)
         budget_pct = phase.get("budget_allocation_percent", 0)
 
-        print(f"\n[{i}] {phase_name.upper()}")
-        print(f"    Days {start}-{end} ({duration} days) | Budget: {budget_pct}%")
+        # Collect the whole phase block and write it once
+        lines = [
+            f"\n[{i}] {phase_name.upper()}",
+            f"    Days {start}-{end} ({duration} days) | Budget: {budget_pct}%",
+        ]
 
         # Objectives
         objectives = phase.get("objectives", [])
         if objectives:
-            print(f"    Objectives:")
-            for obj in objectives:
-                print(f"      • {obj}")
+            lines.append("    Objectives:")
+            lines.extend(f"      • {obj}" for obj in objectives)
 
         # Test combinations
         combos = phase.get("test_combinations", [])
         if combos:
-            print(f"    Test Combinations ({len(combos)}):")
+            lines.append(f"    Test Combinations ({len(combos)}):")
             for combo in combos:
                 combo_budget = combo.get("budget_percent", 0)
-                print(f"      [{combo_budget}%] {combo.get('platform', '?')} + "
-                      f"{combo.get('audience', '?')[:25]} + "
-                      f"{combo.get('creative', '?')[:20]}")
-                if combo.get("rationale"):
-                    rationale = combo["rationale"]
-                    if len(rationale) > 60:
-                        rationale = rationale[:57] + "..."
-                    print(f"           → {rationale}")
+                combo_platform = combo.get("platform")
+                combo_audience = combo.get("audience", "?")
+                combo_creative = combo.get("creative", "?")
+                lines.append(f"      [{combo_budget}%] {combo_platform or '?'} + "
+                             f"{combo_audience[:25]} + {combo_creative[:20]}")
+                rationale = combo.get("rationale")
+                if rationale:
+                    lines.append(f"           → {_trunc(rationale, 60)}")
 
                 # Display creative generation prompts
                 creative = combo.get("creative_generation")
                 if creative:
                     if creative.get("error"):
-                        print(f"           ⚠ Creative: {creative.get('note', 'Manual development required')}")
+                        lines.append(f"           ⚠ Creative: {creative.get('note', 'Manual development required')}")
                     else:
-                        print(f"           📸 Creative Brief:")
+                        total_creatives += 1
+                        platforms_with_creatives.add(combo_platform or "Unknown")
+                        lines.append("           📸 Creative Brief:")
 
                         # Visual prompt (truncated)
                         visual_prompt = creative.get("visual_prompt", "")
                         if visual_prompt:
-                            visual_preview = visual_prompt[:80] + "..." if len(visual_prompt) > 80 else visual_prompt
-                            print(f"              Visual: {visual_preview}")
+                            lines.append(f"              Visual: {_trunc(visual_prompt, 80)}")
 
                         # Ad copy
                         copy_text = creative.get("copy_primary_text", "")
                         if copy_text:
-                            copy_preview = copy_text[:60] + "..." if len(copy_text) > 60 else copy_text
-                            print(f"              Copy: \"{copy_preview}\"")
+                            lines.append(f"              Copy: \"{_trunc(copy_text, 60)}\"")
 
                         # Headline
                         headline = creative.get("copy_headline", "")
                         if headline:
-                            print(f"              Headline: \"{headline}\"")
+                            lines.append(f"              Headline: \"{headline}\"")
 
                         # CTA
                         cta = creative.get("copy_cta", "")
                         if cta:
-                            print(f"              CTA: {cta}")
+                            lines.append(f"              CTA: {cta}")
 
                         # Hooks (show first hook + count)
                         hooks = creative.get("hooks", [])
                         if hooks:
-                            first_hook = hooks[0][:50] + "..." if len(hooks[0]) > 50 else hooks[0]
+                            first_hook = _trunc(hooks[0], 50)
                             additional = f" (+{len(hooks)-1} more)" if len(hooks) > 1 else ""
-                            print(f"              Hooks: \"{first_hook}\"{additional}")
+                            lines.append(f"              Hooks: \"{first_hook}\"{additional}")
 
                         # Technical specs
                         specs = creative.get("technical_specs", {})
                         if specs:
                             aspect_ratio = specs.get("aspect_ratio", "?")
                             dimensions = specs.get("dimensions", "?")
-                            print(f"              Specs: {aspect_ratio} | {dimensions}")
+                            lines.append(f"              Specs: {aspect_ratio} | {dimensions}")
 
         # Success criteria
         criteria = phase.get("success_criteria", [])
         if criteria:
-            print(f"    Success Criteria:")
-            for criterion in criteria:
-                print(f"      ✓ {criterion}")
+            lines.append("    Success Criteria:")
+            lines.extend(f"      ✓ {criterion}" for criterion in criteria)
 
         # Decision triggers
         triggers = phase.get("decision_triggers", {})
         if triggers:
-            print(f"    Decision Triggers:")
-            if triggers.get("proceed_if"):
-                print(f"      → Proceed if: {triggers['proceed_if']}")
-            if triggers.get("pause_if"):
-                print(f"      ⚠ Pause if: {triggers['pause_if']}")
-            if triggers.get("scale_if"):
-                print(f"      ⚡ Scale if: {triggers['scale_if']}")
+            lines.append("    Decision Triggers:")
+            proceed_if = triggers.get("proceed_if")
+            pause_if = triggers.get("pause_if")
+            scale_if = triggers.get("scale_if")
+            if proceed_if:
+                lines.append(f"      → Proceed if: {proceed_if}")
+            if pause_if:
+                lines.append(f"      ⚠ Pause if: {pause_if}")
+            if scale_if:
+                lines.append(f"      ⚡ Scale if: {scale_if}")
+
+        out.write("\n".join(lines))
+        out.write("\n")
 
     # Print checkpoints
     if checkpoints:
-        print(f"\n📍 CHECKPOINT SCHEDULE ({len(checkpoints)} checkpoints):")
-        print("─" * 60)
+        print(f"\n📍 CHECKPOINT SCHEDULE ({len(checkpoints)} checkpoints):", file=out)
+        print(THIN_RULE, file=out)
 
         for checkpoint in checkpoints:
             day = checkpoint.get("day", 0)
@@ -327,209 +477,272 @@ def print_execution_timeline(execution_plan):
             required = checkpoint.get("action_required", False)
             action_mark = "🔴" if required else "🟡"
 
-            print(f"\n  {action_mark} Day {day}: {purpose}")
+            lines = [f"\n  {action_mark} Day {day}: {purpose}"]
 
             review_focus = checkpoint.get("review_focus", [])
             if review_focus:
-                print(f"     Focus:")
-                for focus_item in review_focus:
-                    print(f"       • {focus_item}")
+                lines.append("     Focus:")
+                lines.extend(f"       • {focus_item}" for focus_item in review_focus)
+
+            out.write("\n".join(lines))
+            out.write("\n")
 
     # Print statistical requirements
     stats = execution_plan.get("statistical_requirements", {})
     if stats:
-        print(f"\n📊 STATISTICAL REQUIREMENTS:")
-        print(f"  Min conversions/combo: {stats.get('min_conversions_per_combo', 'N/A')}")
-        print(f"  Confidence level: {stats.get('confidence_level', 'N/A')}")
-        print(f"  Expected weekly conversions: {stats.get('expected_weekly_conversions', 'N/A')}")
-        if stats.get("power_analysis"):
-            print(f"  Power analysis: {stats['power_analysis']}")
+        print(f"\n📊 STATISTICAL REQUIREMENTS:", file=out)
+        print(f"  Min conversions/combo: {stats.get('min_conversions_per_combo', 'N/A')}", file=out)
+        print(f"  Confidence level: {stats.get('confidence_level', 'N/A')}", file=out)
+        print(f"  Expected weekly conversions: {stats.get('expected_weekly_conversions', 'N/A')}", file=out)
+        power_analysis = stats.get("power_analysis")
+        if power_analysis:
+            print(f"  Power analysis: {_cap_text(power_analysis)}", file=out)
 
     # Print risk mitigation
     risks = execution_plan.get("risk_mitigation", {})
     if risks:
-        print(f"\n⚠️  RISK MITIGATION:")
+        print(f"\n⚠️  RISK MITIGATION:", file=out)
 
         early_signals = risks.get("early_warning_signals", [])
         if early_signals:
-            print(f"  Early warning signals:")
+            print(f"  Early warning signals:", file=out)
             for signal in early_signals:
-                print(f"    • {signal}")
+                print(f"    • {signal}", file=out)
 
         contingencies = risks.get("contingency_plans", [])
         if contingencies:
-            print(f"  Contingency plans:")
+            print(f"  Contingency plans:", file=out)
             for plan in contingencies:
-                print(f"    → {plan}")
-
-    # Print creative assets summary
-    total_creatives = 0
-    platforms_with_creatives = set()
-    for phase in phases:
-        for combo in phase.get("test_combinations", []):
-            if combo.get("creative_generation") and not combo.get("creative_generation", {}).get("error"):
-                total_creatives += 1
-                platforms_with_creatives.add(combo.get("platform", "Unknown"))
+                print(f"    → {plan}", file=out)
 
+    # Print creative assets summary (counted during the phase pass)
     if total_creatives > 0:
-        print(f"\n📸 CREATIVE ASSETS SUMMARY:")
-        print(f"  Total creative briefs generated: {total_creatives}")
-        print(f"  Platforms covered: {', '.join(sorted(platforms_with_creatives))}")
-        print(f"  Ready for AI image generation (DALL-E, Midjourney, etc.)")
-
-    print("\n" + "─" * 60)
-    print(f"  ⏱️  Total Duration: {total_days} days (max 30 days)")
-    print(f"  📈 Adaptive approach based on historical performance")
-    print()
+        print(f"\n📸 CREATIVE ASSETS SUMMARY:", file=out)
+        print(f"  Total creative briefs generated: {total_creatives}", file=out)
+        print(f"  Platforms covered: {', '.join(sorted(platforms_with_creatives))}", file=out)
+        print(f"  Ready for AI image generation (DALL-E, Midjourney, etc.)", file=out)
+
+    print("\n" + THIN_RULE, file=out)
+    print(f"  ⏱️  Total Duration: {total_days} days (max 30 days)", file=out)
+    print(f"  📈 Adaptive approach based on historical performance", file=out)
+    print(file=out)
 
 
-def print_results(final_state):
+def print_results(final_state, out=None):
     """Print session results"""
-    print("\n" + "=" * 60)
-    print("  Session Results")
-    print("=" * 60)
+    buf = io.StringIO() if out is None else out
+    _write_results(final_state, buf)
+    if out is None:
+        _emit(buf)
+
+
+def _format_fact_line(key, fact):
+    """Format one knowledge-graph fact as a report line (with newline)"""
+    # Create confidence bar (0-10 blocks)
+    conf = fact.get("confidence", 0)
+    conf_bar = CONFIDENCE_BARS[max(0, min(10, int(conf * 10)))]
+
+    # Format value
+    value = _trunc(str(fact.get("value", "N/A")), 35)
+
+    # Format source
+    source = fact.get("source", "unknown")
+
+    return f"  {key[:28]:28} {value:35} [{conf_bar}] {conf:.2f} ({source})\n"
+
+
+def _save_config(final_state):
+    """Save the session's campaign config to a JSON file, returning its name"""
+    if not final_state.get("current_config"):
+        return None
+
+    filename = f"campaign_{final_state['project_id']}_v{final_state['iteration']}.json"
+    _write_json(filename, final_state["current_config"])
+    return filename
+
+
+def print_results_json(final_state):
+    """Print session results as a single line of compact JSON"""
+    results = {field: final_state.get(field) for field in RESULT_JSON_FIELDS}
+    results["config_file"] = _save_config(final_state)
+    sys.stdout.write(json.dumps(results, separators=(",", ":"), default=str) + "\n")
+    sys.stdout.flush()
+
+
+def _write_results(final_state, out):
+    """Write session results into out"""
+    print("\n" + RULE, file=out)
+    print("  Session Results", file=out)
+    print(RULE, file=out)
 
     # Basic info
-    print(f"\nProject ID: {final_state['project_id']}")
-    print(f"Session: {final_state['session_num']}")
-    print(f"Decision: {final_state.get('decision', 'N/A')}")
-    print(f"Phase: {final_state['current_phase']}")
-    print(f"Iteration: {final_state['iteration']}")
+    print(f"\nProject ID: {final_state['project_id']}", file=out)
+    print(f"Session: {final_state['session_num']}", file=out)
+    print(f"Decision: {final_state.get('decision', 'N/A')}", file=out)
+    print(f"Phase: {final_state['current_phase']}", file=out)
+    print(f"Iteration: {final_state['iteration']}", file=out)
 
     # Flow tracking info
     flow_status = final_state.get('flow_status', 'unknown')
-    print(f"\n--- Flow Status ---")
-    print(f"Status: {flow_status}")
+    print(f"\n--- Flow Status ---", file=out)
+    print(f"Status: {flow_status}", file=out)
     if flow_status == "completed":
-        print("✓ Flow completed successfully")
+        print("✓ Flow completed successfully", file=out)
     elif flow_status == "in_progress":
-        print(f"⚠ Flow incomplete - last completed: {final_state.get('last_completed_node', 'N/A')}")
+        print(f"⚠ Flow incomplete - last completed: {final_state.get('last_completed_node', 'N/A')}", file=out)
     elif flow_status == "failed":
-        print(f"✗ Flow failed at: {final_state.get('current_executing_node', 'N/A')}")
+        print(f"✗ Flow failed at: {final_state.get('current_executing_node', 'N/A')}", file=out)
 
     completed_nodes = final_state.get('completed_nodes', [])
     if completed_nodes:
-        print(f"Completed nodes ({len(completed_nodes)}): {' → '.join(completed_nodes)}")
+        print(f"Completed nodes ({len(completed_nodes)}): {' → '.join(completed_nodes)}", file=out)
 
     # Messages
     if final_state.get("messages"):
-        print("\n--- Messages ---")
+        print("\n--- Messages ---", file=out)
         for msg in final_state["messages"][-5:]:  # Last 5 messages
-            print(f"  • {msg}")
+            print(f"  • {msg}", file=out)
 
     # Knowledge Graph Visualization
     if final_state.get("knowledge_facts"):
-        print("\n--- Knowledge Graph ---")
+        print("\n--- Knowledge Graph ---", file=out)
         kg = final_state["knowledge_facts"]
         if kg:
-            print(f"Total facts: {len(kg)}")
-            print()
-            for key, fact in kg.items():
-                # Create confidence bar (0-10 blocks)
-                conf = fact.get("confidence", 0)
-                conf_bar = "█" * int(conf * 10)
-                conf_bar = f"{conf_bar:10}"  # Pad to 10 chars
-
-                # Format value
-                value = str(fact.get("value", "N/A"))
-                if len(value) > 35:
-                    value = value[:32] + "..."
-
-                # Format source
-                source = fact.get("source", "unknown")
-
-                print(f"  {key[:28]:28} {value:35} [{conf_bar}] {conf:.2f} ({source})")
+            print(f"Total facts: {len(kg)}", file=out)
+            print(file=out)
+            out.writelines(_format_fact_line(key, fact) for key, fact in kg.items())
         else:
-            print("  (No facts discovered)")
+            print("  (No facts discovered)", file=out)
 
     # Errors
     if final_state.get("errors"):
-        print("\n--- Errors ---")
+        print("\n--- Errors ---", file=out)
         for err in final_state["errors"]:
-            print(f"  ⚠ {err}")
+            print(f"  ⚠ {err}", file=out)
 
     # Config summary
     if final_state.get("current_config"):
         config = final_state["current_config"]
-        print("\n--- Campaign Configuration ---")
+        print("\n--- Campaign Configuration ---", file=out)
 
         if "summary" in config:
             summary = config["summary"]
-            print(f"  Total Daily Budget: ${summary.get('total_daily_budget', 0)}")
-            print(f"  Experiment: {summary.get('experiment', 'N/A')}")
+            print(f"  Total Daily Budget: ${summary.get('total_daily_budget', 0)}", file=out)
+            print(f"  Experiment: {summary.get('experiment', 'N/A')}", file=out)
 
         if "tiktok" in config:
-            print(f"\n  TikTok:")
-            print(f"    Budget: ${config['tiktok'].get('daily_budget', 0)}")
-            print(f"    Objective: {config['tiktok'].get('objective', 'N/A')}")
+            print(f"\n  TikTok:", file=out)
+            print(f"    Budget: ${config['tiktok'].get('daily_budget', 0)}", file=out)
+            print(f"    Objective: {config['tiktok'].get('objective', 'N/A')}", file=out)
 
         if "meta" in config:
-            print(f"\n  Meta:")
-            print(f"    Budget: ${config['meta'].get('daily_budget', 0)}")
-            print(f"    Objective: {config['meta'].get('objective', 'N/A')}")
+            print(f"\n  Meta:", file=out)
+            print(f"    Budget: ${config['meta'].get('daily_budget', 0)}", file=out)
+            print(f"    Objective: {config['meta'].get('objective', 'N/A')}", file=out)
 
     # Save config to file
-    if final_state.get("current_config"):
-        filename = f"campaign_{final_state['project_id']}_v{final_state['iteration']}.json"
-        with open(filename, "w") as f:
-            json.dump(final_state["current_config"], f, indent=2)
-        print(f"\n✓ Configuration saved to: {filename}")
+    filename = _save_config(final_state)
+    if filename:
+        print(f"\n✓ Configuration saved to: {filename}", file=out)
 
     # Print detailed strategy breakdown
     if final_state.get("current_strategy"):
-        print_strategy_details(final_state["current_strategy"])
+        print_strategy_details(final_state["current_strategy"], out)
 
     # Print experiment plan
     if final_state.get("experiment_plan"):
-        print_experiment_plan(final_state["experiment_plan"])
+        print_experiment_plan(final_state["experiment_plan"], out)
 
-    print("\n" + "=" * 60)
-    print()
+    print("\n" + RULE, file=out)
+    print(file=out)
+
+
+def _find_missing_files(paths):
+    """
+    Return the paths that don't exist, in input order
+
+    Files sharing a directory are checked against one os.scandir listing of
+    it instead of a stat call each.
+    """
+    by_dir = defaultdict(list)
+    for path in paths:
+        by_dir[path.parent].append(path)
+
+    missing = set()
+    for directory, dir_paths in by_dir.items():
+        if len(dir_paths) == 1:
+            present = set()
+        else:
+            try:
+                # is_file() follows symlinks, so broken ones are not listed
+                with os.scandir(directory) as entries:
+                    present = {entry.name for entry in entries if entry.is_file()}
+            except OSError:
+                present = set()
+        # Anything not in the listing gets a direct check, which also covers
+        # case-insensitive filesystems and single-file directories
+        missing.update(p for p in dir_paths if p.name not in present and not p.exists())
+
+    return [path for path in paths if path in missing]
+
+
+def _find_duplicate_names(paths):
+    """
+    Return {file name: paths} for file names given more than once
+
+    Uploads are stored as <project_id>/<file name>, so two files sharing a
+    name would overwrite each other in storage.
+    """
+    by_name = defaultdict(list)
+    for path in paths:
+        by_name[path.name].append(path)
+    return {name: named for name, named in by_name.items() if len(named) > 1}
+
+
+def _report_flow_status(project):
+    """Print a notice when the project's previous flow did not complete"""
+    flow_status = project.get("flow_status", "not_started")
+    last_completed = project.get("last_completed_node")
+    notice = FLOW_STATUS_NOTICES.get(flow_status)
+    if notice is None or not last_completed:
+        return
+
+    title, resume_note = notice
+    out = io.StringIO()
+    print("\n" + RULE, file=out)
+    print(f"  ⚠️  {title}", file=out)
+    print(RULE, file=out)
+    print(f"Flow status: {flow_status}", file=out)
+    print(f"Last completed node: {last_completed}", file=out)
+    print(f"Completed nodes: {project.get('completed_nodes', [])}", file=out)
+    print(RULE, file=out)
+    print(resume_note, file=out)
+    print("  (Use --restart to force a fresh start)\n", file=out)
+    _emit(out)
 
 
 def run_command(args):
     """Run the agent"""
+    # Imported here so --help and the other commands don't pay for LangGraph,
+    # the LLM client and the database client at startup
+    from src.agent.graph import get_campaign_agent
+    from src.agent.state import create_initial_state
+    from src.database.persistence import SessionPersistence
+    from src.storage.file_manager import hash_file, upload_file
+    from src.utils.progress import get_progress_tracker
+
     print_banner()
 
     # Get or create project (handles both UUID and name)
-    project_id = get_or_create_project(args.project_id)
+    project_id, project = get_or_create_project(args.project_id, _is_uuid(args.project_id))
 
-    # Check if project has incomplete flow
-    if is_valid_uuid(args.project_id):
-        project = ProjectPersistence.load_project(args.project_id)
-        if project:
-            flow_status = project.get("flow_status", "not_started")
-            last_completed = project.get("last_completed_node")
-            completed_nodes = project.get("completed_nodes", [])
-
-            if flow_status == "in_progress" and last_completed:
-                print("\n" + "=" * 60)
-                print("  ⚠️  INCOMPLETE FLOW DETECTED")
-                print("=" * 60)
-                print(f"Flow status: {flow_status}")
-                print(f"Last completed node: {last_completed}")
-                print(f"Completed nodes: {completed_nodes}")
-                print("=" * 60)
-
-                if not args.restart:
-                    print("✓ Will resume from last checkpoint")
-                    print("  (Use --restart to force a fresh start)\n")
-                else:
-                    print("✓ Forcing fresh start (--restart flag used)\n")
-
-            elif flow_status == "failed" and last_completed:
-                print("\n" + "=" * 60)
-                print("  ⚠️  PREVIOUS FLOW FAILED")
-                print("=" * 60)
-                print(f"Last completed node before failure: {last_completed}")
-                print(f"Completed nodes: {completed_nodes}")
-                print("=" * 60)
-
-                if not args.restart:
-                    print("✓ Will retry from failed point")
-                    print("  (Use --restart to force a fresh start)\n")
-                else:
-                    print("✓ Forcing fresh start (--restart flag used)\n")
+    # Check if project has incomplete flow (never the case for a new project).
+    # With --restart the previous flow state is discarded, so don't inspect it.
+    if project:
+        if args.restart:
+            print("✓ Forcing fresh start (--restart flag used)\n")
+        else:
+            _report_flow_status(project)
 
     # Prompt for files or URLs
     print("Upload files or product URLs (comma-separated):")
@@ -542,22 +755,37 @@ def run_command(args):
         print("Error: No files or URLs provided")
         return 1
 
-    # Parse inputs - separate URLs from file paths
-    inputs = [p.strip() for p in input_str.split(",")]
+    # Parse inputs - separate URLs from file paths (skipping empty entries
+    # left by stray commas)
     file_paths = []
     product_urls = []
 
-    for item in inputs:
-        if item.startswith('http://') or item.startswith('https://'):
+    for item in LIST_SEPARATOR_RE.split(input_str):
+        if not item:
+            continue
+        if item.startswith(URL_SCHEMES):
             product_urls.append(item)
         else:
-            file_paths.append(item)
+            file_paths.append(Path(item))
+
+    if not file_paths and not product_urls:
+        print("Error: No files or URLs provided")
+        return 1
 
-    # Validate files exist
-    for path in file_paths:
-        if not Path(path).exists():
+    # Validate files exist (report every missing file, not just the first)
+    missing = _find_missing_files(file_paths)
+    if missing:
+        for path in missing:
             print(f"Error: File not found: {path}")
-            return 1
+        return 1
+
+    # Each upload is stored under its file name, so names must be unique
+    duplicates = _find_duplicate_names(file_paths)
+    if duplicates:
+        for name, named in duplicates.items():
+            print(f"Error: Multiple files named {name}: {', '.join(str(p) for p in named)}")
+        print("Rename the files so each file name is unique")
+        return 1
 
     # Show what we found
     if product_urls:
@@ -574,20 +802,30 @@ def run_command(args):
         print(f"\nUploading {len(file_paths)} file(s) to storage...")
 
         try:
-            from src.storage.file_manager import upload_file
-
-            for path in file_paths:
-                filename = Path(path).name
-                print(f"  Uploading {filename}...", end=" ")
-
-                storage_path = upload_file(path, project_id)
-
-                uploaded_files.append({
+            # Uploads are independent network requests, so run them
+            # concurrently; results keep the order the files were given in
+            storage_paths = [None] * len(file_paths)
+            workers = min(MAX_UPLOAD_WORKERS, len(file_paths))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(upload_file, str(path), project_id): i
+                    for i, path in enumerate(file_paths)
+                }
+                for future in as_completed(futures):
+                    i = futures[future]
+                    storage_paths[i] = future.result()
+                    print(f"  ✓ Uploaded {file_paths[i].name}")
+
+            # The content hash lets analysis reuse a file's cached results
+            # under a new name, and not reuse them after it is overwritten
+            uploaded_files = [
+                {
                     "storage_path": storage_path,
-                    "original_filename": filename
-                })
-
-                print("✓")
+                    "original_filename": path.name,
+                    "content_hash": hash_file(str(path)),
+                }
+                for path, storage_path in zip(file_paths, storage_paths)
+            ]
 
         except Exception as e:
             print(f"\nError uploading files: {str(e)}")
@@ -618,6 +856,11 @@ def run_command(args):
         if args.restart:
             state["force_restart"] = True
 
+        # Hand over the project row loaded above, so the agent doesn't
+        # load it again
+        if project:
+            state["preloaded_project"] = project
+
         # Create session
         session_id = SessionPersistence.create_session(
             project_id=project_id,
@@ -634,24 +877,47 @@ def run_command(args):
         agent = get_campaign_agent()
         final_state = agent.invoke(state)
 
-        # Print results
-        print_results(final_state)
-
-        # Finish tracking
-        tracker.finish()
+        # Print results and finish tracking. With --json the completion
+        # banner goes first, so the JSON stays the last line of output.
+        if args.json:
+            tracker.finish()
+            print_results_json(final_state)
+        else:
+            print_results(final_state)
+            tracker.finish()
 
         return 0
 
     except Exception as e:
         tracker.log_message(f"Error: {str(e)}", "error")
-        import traceback
         traceback.print_exc()
         return 1
 
 
+@functools.lru_cache(maxsize=1)
+def _meta_env():
+    """Read Meta Ads settings and credentials from the environment once"""
+    sandbox_mode = os.getenv('META_SANDBOX_MODE', '').lower() == 'true'
+    access_token = os.getenv('META_ACCESS_TOKEN')
+    ad_account_id = os.getenv('META_AD_ACCOUNT_ID')
+
+    # Use sandbox credentials if in sandbox mode
+    if sandbox_mode:
+        access_token = os.getenv('META_SANDBOX_TOKEN') or access_token
+        ad_account_id = os.getenv('META_SANDBOX_ACCOUNT_ID') or ad_account_id
+
+    return SimpleNamespace(
+        dry_run=os.getenv('META_DRY_RUN', '').lower() == 'true',
+        sandbox_mode=sandbox_mode,
+        access_token=access_token,
+        ad_account_id=ad_account_id,
+        page_id=os.getenv('META_PAGE_ID'),
+        instagram_actor_id=os.getenv('META_INSTAGRAM_ACTOR_ID'),
+    )
+
+
 def deploy_to_meta_command(args):
     """Deploy campaign config to Meta Ads via API"""
-    import os
     from src.integrations.meta_ads import MetaAdsAPI, MetaAdsError
 
     config_path = Path(args.config_path)
@@ -674,33 +940,32 @@ def deploy_to_meta_command(args):
         return 1
 
     # Print banner
-    print("=" * 60)
+    print(RULE)
     print("  Meta Ads Deployment")
-    print("=" * 60)
+    print(RULE)
     print()
     print(f"Config file: {config_path}")
     print(f"Campaign: {meta_config.get('campaign_name', 'Untitled')}")
     print(f"Daily budget: ${meta_config.get('daily_budget', 0)}")
     print()
 
+    env = _meta_env()
+
     # Check for dry-run mode
-    dry_run = args.dry_run or os.getenv('META_DRY_RUN', '').lower() == 'true'
-    sandbox_mode = os.getenv('META_SANDBOX_MODE', '').lower() == 'true'
+    dry_run = args.dry_run or env.dry_run
+    sandbox_mode = env.sandbox_mode
 
     if dry_run:
         print("🔧 DRY RUN MODE: No actual API calls will be made")
         print()
 
-    # Get credentials from environment
-    access_token = os.getenv('META_ACCESS_TOKEN')
-    ad_account_id = os.getenv('META_AD_ACCOUNT_ID')
-    page_id = os.getenv('META_PAGE_ID')
-    instagram_actor_id = os.getenv('META_INSTAGRAM_ACTOR_ID')
+    # Get credentials from environment (sandbox credentials in sandbox mode)
+    access_token = env.access_token
+    ad_account_id = env.ad_account_id
+    page_id = env.page_id
+    instagram_actor_id = env.instagram_actor_id
 
-    # Use sandbox credentials if in sandbox mode
     if sandbox_mode:
-        access_token = os.getenv('META_SANDBOX_TOKEN') or access_token
-        ad_account_id = os.getenv('META_SANDBOX_ACCOUNT_ID') or ad_account_id
         print("🧪 SANDBOX MODE: Using Meta sandbox environment")
         print()
 
@@ -739,9 +1004,9 @@ def deploy_to_meta_command(args):
         result = api.create_campaign_from_config(config)
 
         # Print results
-        print("\n" + "=" * 60)
+        print("\n" + RULE)
         print("  Deployment Complete")
-        print("=" * 60)
+        print(RULE)
         print()
         print(f"✓ Campaign ID: {result['campaign_id']}")
         print(f"✓ Ad Set IDs: {', '.join(result['ad_set_ids'])}")
@@ -762,8 +1027,7 @@ def deploy_to_meta_command(args):
 
         # Save deployment result
         result_filename = config_path.stem + "_deployment_result.json"
-        with open(result_filename, 'w') as f:
-            json.dump(result, f, indent=2)
+        _write_json(result_filename, result)
         print(f"✓ Deployment result saved to: {result_filename}")
         print()
 
@@ -781,7 +1045,6 @@ def deploy_to_meta_command(args):
         return 1
     except Exception as e:
         print(f"\n❌ Unexpected error: {e}")
-        import traceback
         traceback.print_exc()
         return 1
 
@@ -810,20 +1073,17 @@ def export_manual_guide_command(args):
     # Generate manual guide
     output_path = args.output or config_path.stem + "_manual_setup.md"
 
-    print("=" * 60)
+    print(RULE)
     print("  Manual Meta Ads Setup Guide Generator")
-    print("=" * 60)
+    print(RULE)
     print()
     print(f"Reading config: {config_path}")
     print(f"Output file: {output_path}")
     print()
 
-    # Generate checklist content
-    guide_content = generate_manual_checklist(config)
-
-    # Write to file
-    with open(output_path, 'w') as f:
-        f.write(guide_content)
+    # Write checklist straight to the file
+    with open(output_path, 'w', buffering=FILE_WRITE_BUFFER) as f:
+        write_manual_checklist(config, f)
 
     print(f"✓ Manual setup guide generated: {output_path}")
     print()
@@ -836,29 +1096,15 @@ def export_manual_guide_command(args):
     return 0
 
 
-def generate_manual_checklist(config):
-    """Generate customized manual checklist from config"""
-    meta = config.get("meta", {})
-    campaign_name = meta.get("campaign_name", "Untitled Campaign")
-    daily_budget = meta.get("daily_budget", 0)
-    objective = meta.get("objective", "CONVERSIONS")
-
-    targeting = meta.get("targeting", {})
-    age_range = targeting.get("age_range", "18-65")
-    locations = targeting.get("locations", ["US"])
-    detailed = targeting.get("detailed_targeting", {})
-    interests = detailed.get("interests", [])
-    behaviors = detailed.get("behaviors", [])
-
-    placements = meta.get("placements", [])
-    optimization = meta.get("optimization", {})
-    bidding = meta.get("bidding", {})
-    creative_specs = meta.get("creative_specs", {})
-    schedule = meta.get("schedule", {})
+# Human-readable names for Meta campaign objectives in the manual checklist
+OBJECTIVE_LABELS = {
+    "CONVERSIONS": "Sales/Conversions",
+    "OUTCOME_TRAFFIC": "Traffic",
+}
 
-    # Build checklist markdown
-    md = f"""# Manual Meta Ads Setup Checklist
-**Generated from config**: {campaign_name}
+# Fixed opening of the manual checklist, up to the per-location bullets
+MANUAL_CHECKLIST_HEADER = Template("""# Manual Meta Ads Setup Checklist
+**Generated from config**: $campaign_name
 
 This checklist guides you through creating ads manually in Meta Ads Manager using your agent-generated config.
 
@@ -866,180 +1112,231 @@ This checklist guides you through creating ads manually in Meta Ads Manager usin
 
 ---
 
-## Campaign: {campaign_name}
+## Campaign: $campaign_name
 
 ### Campaign Setup
 - [ ] Log in to [Meta Ads Manager](https://business.facebook.com/adsmanager)
 - [ ] Click **Create** campaign
-- [ ] Select objective: **{objective}** ({"Sales/Conversions" if objective == "CONVERSIONS" else "Traffic" if objective == "OUTCOME_TRAFFIC" else objective})
-- [ ] Campaign name: `{campaign_name}`
+- [ ] Select objective: **$objective** ($objective_label)
+- [ ] Campaign name: `$campaign_name`
 - [ ] Special ad categories: None (unless applicable)
 - [ ] Click **Continue**
 
 ---
 
-## Ad Set: {campaign_name} - Ad Set 1
+## Ad Set: $campaign_name - Ad Set 1
 
 ### Budget & Schedule
-- [ ] Daily budget: **${daily_budget:.2f}/day**
-- [ ] Start date: {schedule.get("start_date", "Set to today or desired date")}
-- [ ] End date: {"No end date" if not schedule.get("end_date") else schedule.get("end_date")}
+- [ ] Daily budget: **$$${daily_budget}/day**
+- [ ] Start date: $start_date
+- [ ] End date: $end_date
 
 ### Audience Targeting
 
 #### Locations
+""")
+
+# Static sections of the manual checklist that don't depend on the config
+MANUAL_CHECKLIST_PLACEMENTS_INTRO = """
+### Placements
+- [ ] Select **Manual Placements**
+- [ ] Uncheck **Automatic Placements**
+Check only these placements:
 """
 
+MANUAL_CHECKLIST_REVIEW = """
+### Instagram (if using Instagram placements)
+- [ ] Connect Instagram account
+- [ ] Verify Instagram actor ID is set
+
+---
+
+## Review & Publish
+
+- [ ] Review all settings against this checklist
+- [ ] Generate ad preview for each placement
+- [ ] Check image/video displays correctly
+- [ ] Verify text not cut off
+- [ ] Set status to **PAUSED**
+- [ ] Click **Publish**
+- [ ] Wait for ad review (24-48 hours)
+- [ ] Check review status in Ads Manager
+- [ ] Activate when approved
+"""
+
+MANUAL_CHECKLIST_FOOTER = """
+---
+
+**Generated by Adronaut Agent**
+
+For detailed instructions, see: `/docs/MANUAL_META_ADS_SETUP.md`
+"""
+
+
+def _creative_formats(creative_specs):
+    """Return creative_specs.formats as a list of strings (configs may give a bare value or null)"""
+    formats = creative_specs.get("formats")
+    if formats is None:
+        return ["Video or Image"]
+    if isinstance(formats, list):
+        return [str(fmt) for fmt in formats]
+    return [str(formats)]
+
+
+def write_manual_checklist(config, out):
+    """
+    Write customized manual checklist markdown to a text stream
+
+    Args:
+        config: Campaign config dict with a "meta" section
+        out: Writable text stream (file or StringIO)
+    """
+    meta = config.get("meta", {})
+    campaign_name = meta.get("campaign_name", "Untitled Campaign")
+    daily_budget = meta.get("daily_budget", 0)
+    objective = meta.get("objective", "CONVERSIONS")
+
+    targeting = meta.get("targeting", {})
+    age_range = targeting.get("age_range", "18-65")
+    locations = targeting.get("locations", ["US"])
+    detailed = targeting.get("detailed_targeting", {})
+    interests = detailed.get("interests", [])
+    behaviors = detailed.get("behaviors", [])
+
+    placements = meta.get("placements", [])
+    optimization = meta.get("optimization", {})
+    bidding = meta.get("bidding", {})
+    creative_specs = meta.get("creative_specs", {})
+    schedule = meta.get("schedule", {})
+
+    # Write checklist markdown
+    out.write(MANUAL_CHECKLIST_HEADER.substitute(
+        campaign_name=campaign_name,
+        objective=objective,
+        objective_label=OBJECTIVE_LABELS.get(objective, objective),
+        daily_budget=f"{daily_budget:.2f}",
+        start_date=schedule.get("start_date", "Set to today or desired date"),
+        end_date=schedule.get("end_date") or "No end date",
+    ))
+
     # Add locations
-    for loc in locations:
-        md += f"- [ ] Add location: **{loc}**\n"
+    out.writelines(f"- [ ] Add location: **{loc}**\n" for loc in locations)
 
-    md += f"\n#### Demographics\n"
-    md += f"- [ ] Age: **{age_range}**\n"
-    md += f"- [ ] Gender: **{targeting.get('gender', 'All')}**\n"
+    out.write(f"\n#### Demographics\n")
+    out.write(f"- [ ] Age: **{age_range}**\n")
+    out.write(f"- [ ] Gender: **{targeting.get('gender', 'All')}**\n")
 
     # Language
-    if targeting.get("language"):
-        md += f"- [ ] Language: **{targeting.get('language')}**\n"
+    language = targeting.get("language")
+    if language:
+        out.write(f"- [ ] Language: **{language}**\n")
 
     # Detailed targeting
-    md += "\n#### Detailed Targeting\n"
+    out.write("\n#### Detailed Targeting\n")
     if interests:
-        md += "**Interests** (add each):\n"
-        for interest in interests:
-            md += f"- [ ] {interest}\n"
+        out.write("**Interests** (add each):\n")
+        out.writelines(f"- [ ] {interest}\n" for interest in interests)
 
     if behaviors:
-        md += "\n**Behaviors** (add each):\n"
-        for behavior in behaviors:
-            md += f"- [ ] {behavior}\n"
+        out.write("\n**Behaviors** (add each):\n")
+        out.writelines(f"- [ ] {behavior}\n" for behavior in behaviors)
 
     # Custom audiences
     custom = targeting.get("custom_audiences", [])
     if custom:
-        md += "\n**Custom Audiences**:\n"
-        for aud in custom:
-            md += f"- [ ] {aud}\n"
+        out.write("\n**Custom Audiences**:\n")
+        out.writelines(f"- [ ] {aud}\n" for aud in custom)
 
     # Placements
-    md += f"\n### Placements\n"
-    md += "- [ ] Select **Manual Placements**\n"
-    md += "- [ ] Uncheck **Automatic Placements**\n"
-    md += "Check only these placements:\n"
-    for placement in placements:
-        md += f"- [ ] {placement}\n"
+    out.write(MANUAL_CHECKLIST_PLACEMENTS_INTRO)
+    out.writelines(f"- [ ] {placement}\n" for placement in placements)
 
     # Optimization
-    md += f"\n### Optimization & Delivery\n"
+    out.write(f"\n### Optimization & Delivery\n")
     opt_goal = optimization.get("optimization_goal", "CONVERSIONS")
-    md += f"- [ ] Performance goal: **{opt_goal}**\n"
+    out.write(f"- [ ] Performance goal: **{opt_goal}**\n")
 
     if opt_goal == "CONVERSIONS":
-        md += f"- [ ] Conversion event: **{optimization.get('pixel_event', 'Purchase')}**\n"
+        out.write(f"- [ ] Conversion event: **{optimization.get('pixel_event', 'Purchase')}**\n")
 
     attribution = optimization.get("conversion_window", "7_DAY_CLICK")
-    md += f"- [ ] Attribution: **{attribution}**\n"
+    out.write(f"- [ ] Attribution: **{attribution}**\n")
 
     # Bidding
-    md += f"\n### Bidding Strategy\n"
+    out.write(f"\n### Bidding Strategy\n")
     bid_strategy = bidding.get("strategy", "LOWEST_COST_WITHOUT_CAP")
 
     if bid_strategy == "LOWEST_COST_WITH_BID_CAP":
         bid_amount = bidding.get("bid_amount", 0)
-        md += f"- [ ] Bid strategy: **Cost per result goal**\n"
-        md += f"- [ ] Bid cap: **${bid_amount:.2f}**\n"
+        out.write(f"- [ ] Bid strategy: **Cost per result goal**\n")
+        out.write(f"- [ ] Bid cap: **${bid_amount:.2f}**\n")
     else:
-        md += f"- [ ] Bid strategy: **Highest volume** (no bid cap)\n"
+        out.write(f"- [ ] Bid strategy: **Highest volume** (no bid cap)\n")
 
-    md += f"- [ ] Billing: **Impressions** (default)\n"
+    out.write(f"- [ ] Billing: **Impressions** (default)\n")
 
     # Creative
-    md += f"\n---\n\n## Creative\n\n"
-    md += "### Upload Media\n"
+    out.write(f"\n---\n\n## Creative\n\n")
+    out.write("### Upload Media\n")
 
-    formats = creative_specs.get("formats", ["Video or Image"])
-    if isinstance(formats, list):
-        formats_str = ", ".join(formats)
-    else:
-        formats_str = formats
-
-    md += f"- [ ] Format: {formats_str}\n"
+    out.write(f"- [ ] Format: {', '.join(_creative_formats(creative_specs))}\n")
 
     duration = creative_specs.get("duration")
     if duration:
-        md += f"- [ ] Duration: {duration}\n"
+        out.write(f"- [ ] Duration: {duration}\n")
 
     aspect_ratio = creative_specs.get("aspect_ratio")
     if aspect_ratio:
-        md += f"- [ ] Aspect ratio: {aspect_ratio}\n"
+        out.write(f"- [ ] Aspect ratio: {aspect_ratio}\n")
 
-    md += "\n### Ad Copy\n"
+    out.write("\n### Ad Copy\n")
 
     # Messaging
     messaging = creative_specs.get("messaging", [])
     if messaging:
-        md += "**Primary Text** (use these themes):\n"
-        for msg in messaging[:3]:  # First 3
-            md += f"- {msg}\n"
-        md += "\n- [ ] Write primary text incorporating above themes\n"
+        out.write("**Primary Text** (use these themes):\n")
+        out.writelines(f"- {msg}\n" for msg in islice(messaging, 3))  # First 3
+        out.write("\n- [ ] Write primary text incorporating above themes\n")
     else:
-        md += "- [ ] Write primary text\n"
+        out.write("- [ ] Write primary text\n")
 
     # Headline
     headline = creative_specs.get("name")
     if headline:
-        md += f"\n**Headline**:\n"
-        md += f"- [ ] Enter: \"{headline}\"\n"
+        out.write(f"\n**Headline**:\n")
+        out.write(f"- [ ] Enter: \"{headline}\"\n")
     else:
-        md += f"- [ ] Enter headline (40 characters max)\n"
+        out.write(f"- [ ] Enter headline (40 characters max)\n")
 
     # Destination & CTA
-    md += f"\n### Destination\n"
+    out.write(f"\n### Destination\n")
 
     link = creative_specs.get("link", "https://your-website.com")
-    md += f"- [ ] Website URL: `{link}`\n"
-
-    cta_type = creative_specs.get("call_to_action", {}).get("type", "SHOP_NOW")
-    md += f"- [ ] Call to Action: **{cta_type}**\n"
-
-    # Instagram
-    md += f"\n### Instagram (if using Instagram placements)\n"
-    md += f"- [ ] Connect Instagram account\n"
-    md += f"- [ ] Verify Instagram actor ID is set\n"
-
-    # Review
-    md += f"\n---\n\n## Review & Publish\n\n"
-    md += f"- [ ] Review all settings against this checklist\n"
-    md += f"- [ ] Generate ad preview for each placement\n"
-    md += f"- [ ] Check image/video displays correctly\n"
-    md += f"- [ ] Verify text not cut off\n"
-    md += f"- [ ] Set status to **PAUSED**\n"
-    md += f"- [ ] Click **Publish**\n"
-    md += f"- [ ] Wait for ad review (24-48 hours)\n"
-    md += f"- [ ] Check review status in Ads Manager\n"
-    md += f"- [ ] Activate when approved\n"
+    out.write(f"- [ ] Website URL: `{link}`\n")
+
+    call_to_action = creative_specs.get("call_to_action") or {}
+    cta_type = call_to_action.get("type", "SHOP_NOW")
+    out.write(f"- [ ] Call to Action: **{cta_type}**\n")
+
+    # Instagram and review
+    out.write(MANUAL_CHECKLIST_REVIEW)
 
     # Summary
     summary = config.get("summary", {})
     if summary:
-        md += f"\n---\n\n## Campaign Summary\n\n"
-        md += f"**Total Daily Budget**: ${summary.get('total_daily_budget', 0)}\n\n"
+        out.write(f"\n---\n\n## Campaign Summary\n\n")
+        out.write(f"**Total Daily Budget**: ${summary.get('total_daily_budget', 0)}\n\n")
 
         experiment = summary.get("experiment")
         if experiment:
-            md += f"**Experiment**: {experiment}\n\n"
+            out.write(f"**Experiment**: {experiment}\n\n")
 
         expected = summary.get("expected_outcomes", {})
         if expected:
-            md += f"**Expected Outcomes**:\n"
-            for key, value in expected.items():
-                md += f"- {key}: {value}\n"
+            out.write(f"**Expected Outcomes**:\n")
+            out.writelines(f"- {key}: {value}\n" for key, value in expected.items())
 
-    md += f"\n---\n\n"
-    md += f"**Generated by Adronaut Agent**\n\n"
-    md += f"For detailed instructions, see: `/docs/MANUAL_META_ADS_SETUP.md`\n"
-
-    return md
+    out.write(MANUAL_CHECKLIST_FOOTER)
 
 
 def test_creative_command(args):
@@ -1051,17 +1348,17 @@ def test_creative_command(args):
 
     print_banner()
     print("🎨 TEST CREATIVE WORKFLOW")
-    print("=" * 60)
+    print(RULE)
     print()
 
     # Parse keywords if provided
     required_keywords = None
     if args.keywords:
-        required_keywords = [k.strip() for k in args.keywords.split(",")]
+        required_keywords = [k for k in LIST_SEPARATOR_RE.split(args.keywords.strip()) if k]
 
     # Print input summary
     print("INPUT SUMMARY:")
-    print(f"  Product: {args.product_description[:100]}{'...' if len(args.product_description) > 100 else ''}")
+    print(f"  Product: {_trunc(args.product_description, 100)}")
     if args.product_image:
         print(f"  Image: {args.product_image}")
     print(f"  Platform: {args.platform}")
@@ -1098,9 +1395,9 @@ def test_creative_command(args):
         )
 
         print()
-        print("=" * 60)
+        print(RULE)
         print("  RESULTS SAVED")
-        print("=" * 60)
+        print(RULE)
         print(f"📄 JSON file: {output_path}")
         print()
 
@@ -1109,230 +1406,253 @@ def test_creative_command(args):
     except Exception as e:
         print()
         print(f"❌ Error: {str(e)}")
-        import traceback
         traceback.print_exc()
         return 1
 
 
-def display_test_creative_results(results: dict):
+def display_test_creative_results(results: dict, out=None):
     """Display test creative workflow results in terminal"""
+    buf = io.StringIO() if out is None else out
+    _write_test_creative_results(results, buf)
+    if out is None:
+        _emit(buf)
 
-    print("=" * 60)
-    print("  WORKFLOW RESULTS")
-    print("=" * 60)
-    print()
+
+def _write_test_creative_results(results, out):
+    """Write test creative workflow results into out"""
+    print(RULE, file=out)
+    print("  WORKFLOW RESULTS", file=out)
+    print(RULE, file=out)
+    print(file=out)
 
     summary = results.get("summary", {})
     steps = results.get("workflow_steps", {})
 
     # Summary
-    print("SUMMARY:")
-    print(f"  Platform: {summary.get('platform', 'N/A')}")
-    print(f"  Audience: {summary.get('audience', 'N/A')}")
-    print(f"  Creative Style: {summary.get('creative_style', 'N/A')}")
-    print(f"  Prompt Changed in Review: {'Yes' if summary.get('prompt_changed_in_review') else 'No'}")
-    print(f"  Validation Passed: {'Yes ✓' if summary.get('validation_passed') else 'No ✗'}")
-    print(f"  Final Score: {summary.get('final_score', 0)}/100")
-    print()
+    print("SUMMARY:", file=out)
+    print(f"  Platform: {summary.get('platform', 'N/A')}", file=out)
+    print(f"  Audience: {summary.get('audience', 'N/A')}", file=out)
+    print(f"  Creative Style: {summary.get('creative_style', 'N/A')}", file=out)
+    print(f"  Prompt Changed in Review: {'Yes' if summary.get('prompt_changed_in_review') else 'No'}", file=out)
+    print(f"  Validation Passed: {'Yes ✓' if summary.get('validation_passed') else 'No ✗'}", file=out)
+    print(f"  Final Score: {summary.get('final_score', 0)}/100", file=out)
+    print(file=out)
 
     # Step 1: Generation
     step1 = steps.get("step1_generation", {})
     if step1:
-        print("─" * 60)
-        print("STEP 1: INITIAL GENERATION")
-        print("─" * 60)
-        print(f"Original Prompt Length: {len(step1.get('original_prompt', ''))} chars")
-        print(f"Headline: {step1.get('copy_headline', 'N/A')}")
-        print(f"Primary Text: {step1.get('copy_primary_text', 'N/A')[:100]}...")
-        print(f"CTA: {step1.get('copy_cta', 'N/A')}")
-        print(f"Hooks: {len(step1.get('hooks', []))} hooks generated")
-        print()
+        print(THIN_RULE, file=out)
+        print("STEP 1: INITIAL GENERATION", file=out)
+        print(THIN_RULE, file=out)
+        print(f"Original Prompt Length: {len(step1.get('original_prompt', ''))} chars", file=out)
+        print(f"Headline: {step1.get('copy_headline', 'N/A')}", file=out)
+        print(f"Primary Text: {step1.get('copy_primary_text', 'N/A')[:100]}...", file=out)
+        print(f"CTA: {step1.get('copy_cta', 'N/A')}", file=out)
+        print(f"Hooks: {len(step1.get('hooks', []))} hooks generated", file=out)
+        print(file=out)
 
     # Step 2: Review
     step2 = steps.get("step2_review", {})
     if step2:
-        print("─" * 60)
-        print("STEP 2: PROMPT REVIEW")
-        print("─" * 60)
-        print(f"Reviewed Prompt Length: {len(step2.get('reviewed_prompt', ''))} chars")
-        print(f"Changed: {'Yes' if step2.get('changed') else 'No'}")
-        if step2.get('review_notes'):
-            print(f"Review Notes: {step2.get('review_notes')[:200]}{'...' if len(step2.get('review_notes', '')) > 200 else ''}")
-        print()
+        print(THIN_RULE, file=out)
+        print("STEP 2: PROMPT REVIEW", file=out)
+        print(THIN_RULE, file=out)
+        print(f"Reviewed Prompt Length: {len(step2.get('reviewed_prompt', ''))} chars", file=out)
+        print(f"Changed: {'Yes' if step2.get('changed') else 'No'}", file=out)
+        review_notes = step2.get('review_notes')
+        if review_notes:
+            print(f"Review Notes: {_trunc(review_notes, 200)}", file=out)
+        print(file=out)
 
     # Step 3: Creative
     step3 = steps.get("step3_creative", {})
     if step3:
-        print("─" * 60)
-        print("STEP 3: FINAL CREATIVE OUTPUT")
-        print("─" * 60)
-        print(f"Ready for Image Generation: {'Yes ✓' if step3.get('ready_for_image_generation') else 'No ✗'}")
+        print(THIN_RULE, file=out)
+        print("STEP 3: FINAL CREATIVE OUTPUT", file=out)
+        print(THIN_RULE, file=out)
+        print(f"Ready for Image Generation: {'Yes ✓' if step3.get('ready_for_image_generation') else 'No ✗'}", file=out)
 
         validation = step3.get("validation", {})
         if validation:
-            print(f"Validation Status: {'Passed ✓' if validation.get('is_valid') else 'Failed ✗'}")
-            if validation.get('errors'):
-                print(f"Validation Warnings: {', '.join(validation.get('errors', []))}")
-
-        print()
-        print("FINAL VISUAL PROMPT:")
-        print("─" * 60)
+            print(f"Validation Status: {'Passed ✓' if validation.get('is_valid') else 'Failed ✗'}", file=out)
+            errors = validation.get("errors")
+            if errors:
+                print(f"Validation Warnings: {', '.join(errors)}", file=out)
+
+        print(file=out)
+        print("FINAL VISUAL PROMPT:", file=out)
+        print(THIN_RULE, file=out)
         prompt_text = step3.get('final_visual_prompt', '')
         # Display first 500 chars
         if len(prompt_text) > 500:
-            print(prompt_text[:500] + "...")
-            print(f"[Total length: {len(prompt_text)} chars]")
+            print(prompt_text[:500] + "...", file=out)
+            print(f"[Total length: {len(prompt_text)} chars]", file=out)
         else:
-            print(prompt_text)
-        print()
+            print(prompt_text, file=out)
+        print(file=out)
 
     # Step 4: Rating
     step4 = steps.get("step4_rating", {})
     if step4 and step4.get("success"):
-        print("─" * 60)
-        print("STEP 4: QUALITY RATING")
-        print("─" * 60)
-        print(f"Overall Score: {step4.get('overall_score', 0)}/100")
-        print()
+        print(THIN_RULE, file=out)
+        print("STEP 4: QUALITY RATING", file=out)
+        print(THIN_RULE, file=out)
+        print(f"Overall Score: {step4.get('overall_score', 0)}/100", file=out)
+        print(file=out)
 
         # Category scores
         category_scores = step4.get("category_scores", {})
         if category_scores:
-            print("Category Scores (0-10):")
+            print("Category Scores (0-10):", file=out)
             for category, score in category_scores.items():
-                bar = "█" * score + "░" * (10 - score)
-                print(f"  {category.replace('_', ' ').title():25s} {bar} {score}/10")
-            print()
+                label = category.replace("_", " ").title()
+                print(f"  {label:25s} {_score_bar(score)} {score}/10", file=out)
+            print(file=out)
 
         # Keyword analysis
         keyword_analysis = step4.get("keyword_analysis", {})
         if keyword_analysis and not keyword_analysis.get("error"):
-            print("Keyword Analysis:")
+            print("Keyword Analysis:", file=out)
             found = keyword_analysis.get("required_keywords_found", [])
             missing = keyword_analysis.get("required_keywords_missing", [])
             if found:
-                print(f"  ✓ Found: {', '.join(found)}")
+                print(f"  ✓ Found: {', '.join(found)}", file=out)
             if missing:
-                print(f"  ✗ Missing: {', '.join(missing)}")
-            print()
+                print(f"  ✗ Missing: {', '.join(missing)}", file=out)
+            print(file=out)
 
         # Brand presence
         brand_presence = step4.get("brand_presence", {})
         if brand_presence and not brand_presence.get("error"):
-            print("Brand Presence:")
-            print(f"  Brand Mentioned: {'Yes ✓' if brand_presence.get('brand_mentioned') else 'No ✗'}")
-            print(f"  Logo Described: {'Yes ✓' if brand_presence.get('logo_described') else 'No ✗'}")
-            print(f"  Prominence: {brand_presence.get('prominence_level', 'N/A')}")
-            print()
+            print("Brand Presence:", file=out)
+            print(f"  Brand Mentioned: {'Yes ✓' if brand_presence.get('brand_mentioned') else 'No ✗'}", file=out)
+            print(f"  Logo Described: {'Yes ✓' if brand_presence.get('logo_described') else 'No ✗'}", file=out)
+            print(f"  Prominence: {brand_presence.get('prominence_level', 'N/A')}", file=out)
+            print(file=out)
 
         # Strengths
         strengths = step4.get("strengths", [])
         if strengths:
-            print("Strengths:")
+            print("Strengths:", file=out)
             for strength in strengths:
-                print(f"  ✓ {strength}")
-            print()
+                print(f"  ✓ {strength}", file=out)
+            print(file=out)
 
         # Weaknesses
         weaknesses = step4.get("weaknesses", [])
         if weaknesses:
-            print("Weaknesses:")
+            print("Weaknesses:", file=out)
             for weakness in weaknesses:
-                print(f"  ⚠ {weakness}")
-            print()
+                print(f"  ⚠ {weakness}", file=out)
+            print(file=out)
 
         # Suggestions
         suggestions = step4.get("suggestions", [])
         if suggestions:
-            print("Suggestions for Improvement:")
+            print("Suggestions for Improvement:", file=out)
             for i, suggestion in enumerate(suggestions, 1):
-                print(f"  {i}. {suggestion}")
-            print()
+                print(f"  {i}. {suggestion}", file=out)
+            print(file=out)
 
     # Step 5: Image Generation
     step5 = steps.get("step5_image_generation", {})
     if step5:
-        print("─" * 60)
-        print("STEP 5: IMAGE GENERATION")
-        print("─" * 60)
+        print(THIN_RULE, file=out)
+        print("STEP 5: IMAGE GENERATION", file=out)
+        print(THIN_RULE, file=out)
         if step5.get("success"):
-            print(f"✓ Image Generated Successfully")
-            print(f"Path: {step5.get('image_path')}")
-            print(f"Model: {step5.get('model')}")
-            print(f"Aspect Ratio: {step5.get('aspect_ratio')}")
+            print(f"✓ Image Generated Successfully", file=out)
+            print(f"Path: {step5.get('image_path')}", file=out)
+            print(f"Model: {step5.get('model')}", file=out)
+            print(f"Aspect Ratio: {step5.get('aspect_ratio')}", file=out)
         else:
-            print(f"✗ Image Generation Failed")
-            print(f"Error: {step5.get('error', 'Unknown error')}")
-        print()
+            print(f"✗ Image Generation Failed", file=out)
+            print(f"Error: {step5.get('error', 'Unknown error')}", file=out)
+        print(file=out)
 
     # Step 6: Image Rating
     step6 = steps.get("step6_image_rating", {})
     if step6:
-        print("─" * 60)
-        print("STEP 6: IMAGE QUALITY RATING")
-        print("─" * 60)
+        print(THIN_RULE, file=out)
+        print("STEP 6: IMAGE QUALITY RATING", file=out)
+        print(THIN_RULE, file=out)
 
         if step6.get("success"):
-            print(f"Overall Score: {step6.get('overall_score', 0)}/100")
-            print()
+            print(f"Overall Score: {step6.get('overall_score', 0)}/100", file=out)
+            print(file=out)
 
             # Category scores
             category_scores = step6.get("category_scores", {})
             if category_scores:
-                print("Category Scores (0-10):")
+                print("Category Scores (0-10):", file=out)
                 for category, score in category_scores.items():
-                    bar = "█" * score + "░" * (10 - score)
-                    print(f"  {category.replace('_', ' ').title():25s} {bar} {score}/10")
-                print()
+                    label = category.replace("_", " ").title()
+                    print(f"  {label:25s} {_score_bar(score)} {score}/10", file=out)
+                print(file=out)
 
             # Prompt match details
             prompt_match = step6.get("prompt_match_details", {})
             if prompt_match:
-                print("Prompt Match Analysis:")
+                print("Prompt Match Analysis:", file=out)
                 matched = prompt_match.get("matched_elements", [])
                 missing = prompt_match.get("missing_elements", [])
                 if matched:
-                    print(f"  ✓ Matched: {', '.join(matched[:3])}")
+                    print(f"  ✓ Matched: {', '.join(matched[:3])}", file=out)
                 if missing:
-                    print(f"  ✗ Missing: {', '.join(missing[:3])}")
-                print()
+                    print(f"  ✗ Missing: {', '.join(missing[:3])}", file=out)
+                print(file=out)
 
             # Strengths
             strengths = step6.get("strengths", [])
             if strengths:
-                print("Image Strengths:")
+                print("Image Strengths:", file=out)
                 for strength in strengths:
-                    print(f"  ✓ {strength}")
-                print()
+                    print(f"  ✓ {strength}", file=out)
+                print(file=out)
 
             # Weaknesses
             weaknesses = step6.get("weaknesses", [])
             if weaknesses:
-                print("Image Weaknesses:")
+                print("Image Weaknesses:", file=out)
                 for weakness in weaknesses:
-                    print(f"  ⚠ {weakness}")
-                print()
+                    print(f"  ⚠ {weakness}", file=out)
+                print(file=out)
 
             # Suggestions
             suggestions = step6.get("suggestions", [])
             if suggestions:
-                print("Suggestions for Improvement:")
+                print("Suggestions for Improvement:", file=out)
                 for i, suggestion in enumerate(suggestions, 1):
-                    print(f"  {i}. {suggestion}")
-                print()
+                    print(f"  {i}. {suggestion}", file=out)
+                print(file=out)
         elif step6.get("skipped"):
-            print(f"⚠ Image Review Skipped")
-            print(f"Reason: {step6.get('reason', 'Unknown')}")
-            print()
+            print(f"⚠ Image Review Skipped", file=out)
+            print(f"Reason: {step6.get('reason', 'Unknown')}", file=out)
+            print(file=out)
         else:
             # Failed
-            print(f"✗ Image Review Failed")
-            print(f"Error: {step6.get('error', 'Unknown error')}")
-            print()
+            print(f"✗ Image Review Failed", file=out)
+            print(f"Error: {step6.get('error', 'Unknown error')}", file=out)
+            print(file=out)
 
 
-def main():
-    """Main CLI entry point"""
+# Subcommand name -> handler
+COMMANDS = {
+    "run": run_command,
+    "test-creative": test_creative_command,
+    "deploy-to-meta": deploy_to_meta_command,
+    "export-manual-guide": export_manual_guide_command,
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _build_parser():
+    """
+    Build the CLI argument parser
+
+    Returns:
+        argparse.ArgumentParser with one subparser per command
+    """
     parser = argparse.ArgumentParser(
         description="Campaign Setup Agent - Intelligent Campaign Optimizer"
     )
@@ -1351,6 +1671,11 @@ def main():
         action="store_true",
         help="Force restart flow even if resumption is possible (clears flow state)"
     )
+    run_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print session results as one line of compact JSON instead of the formatted report"
+    )
 
     # Test creative command
     test_creative_parser = subparsers.add_parser(
@@ -1424,22 +1749,19 @@ def main():
         help="Output markdown file path (default: <config>_manual_setup.md)"
     )
 
+    return parser
+
+
+def main():
+    """Main CLI entry point"""
+    parser = _build_parser()
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         return 1
 
-    if args.command == "run":
-        return run_command(args)
-    elif args.command == "test-creative":
-        return test_creative_command(args)
-    elif args.command == "deploy-to-meta":
-        return deploy_to_meta_command(args)
-    elif args.command == "export-manual-guide":
-        return export_manual_guide_command(args)
-
-    return 0
+    return COMMANDS[args.command](args)
 
 
 if __name__ == "__main__":
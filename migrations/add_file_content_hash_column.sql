@@ -0,0 +1,12 @@
+-- Migration: Add content_hash column to uploaded_files table
+-- Run this in your Supabase SQL Editor if you have an existing database
+-- Purpose: Match cached file analysis by file contents instead of storage path
+
+-- Add content_hash column to uploaded_files table
+ALTER TABLE uploaded_files ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+-- Add index for content lookups within a project
+CREATE INDEX IF NOT EXISTS idx_uploaded_files_content_hash ON uploaded_files(project_id, content_hash);
+
+-- Add comment for documentation
+COMMENT ON COLUMN uploaded_files.content_hash IS 'SHA-256 of the file contents, so cached analysis follows the contents rather than the filename';
@@ -2,6 +2,8 @@
 LangGraph workflow assembly with resumption support
 """
 
+import functools
+
 from langgraph.graph import StateGraph, END
 from .state import AgentState
 from .nodes import (
@@ -18,6 +20,9 @@ from .nodes import (
 )
 from .router import router_node, get_next_node, get_resume_node
 
+# Nodes that must have completed before a resumed run can skip to the router
+RESUME_PREREQUISITES = frozenset(("analyze_files", "router"))
+
 
 def should_skip_to_resume_point(state: AgentState) -> str:
     """
@@ -40,7 +45,7 @@ def should_skip_to_resume_point(state: AgentState) -> str:
         return "normal"
 
     # If we've already completed analyze_files and router, skip to resume point
-    if "analyze_files" in completed_nodes and "router" in completed_nodes:
+    if RESUME_PREREQUISITES.issubset(completed_nodes):
         return "resume"
 
     return "normal"
@@ -123,18 +128,12 @@ def create_campaign_agent_graph():
     return workflow.compile()
 
 
-# Create singleton instance
-_graph = None
-
-
+@functools.cache
 def get_campaign_agent():
     """
-    Get or create the campaign agent graph
+    Get or create the campaign agent graph (compiled once per process)
 
     Returns:
         Compiled LangGraph workflow
     """
-    global _graph
-    if _graph is None:
-        _graph = create_campaign_agent_graph()
-    return _graph
+    return create_campaign_agent_graph()
@@ -2,11 +2,21 @@
 Core agent nodes for the LangGraph workflow
 """
 
+import hashlib
+import json
 import os
-from typing import Dict, Any
-from functools import wraps
+import reprlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from itertools import chain, islice
+from typing import Deque, Dict, Any, List, Optional, Tuple
+from functools import lru_cache, wraps
 from tavily import TavilyClient
 from ..database.persistence import ProjectPersistence, SessionPersistence, CyclePersistence
+from ..database.file_persistence import FilePersistence
+from ..storage.file_manager import download_file
+from ..llm.gemini import get_gemini
 from ..modules.data_loader import DataLoader
 from ..modules.insight import generate_insights_and_strategy
 from ..modules.campaign import generate_campaign_config
@@ -14,6 +24,95 @@ from ..modules.reflection import analyze_experiment_results, generate_patch_stra
 from .state import AgentState, load_project_into_state, state_to_project_dict
 from ..utils.progress import get_progress_tracker
 
+# Project fields as last auto-saved by track_node (serialized), per project_id,
+# so each auto-save only writes the columns the node changed
+_auto_saved_fields: Dict[str, Dict[str, str]] = {}
+
+# Auto-saves are written on one background thread so the next node doesn't
+# wait on the database; a single worker keeps the writes in order. Their
+# results are logged from the main thread (see _log_auto_saves), so status
+# lines never interleave with node output or input() prompts, and only the
+# main thread touches _auto_saved_fields.
+_auto_save_executor = ThreadPoolExecutor(max_workers=1)
+_pending_auto_saves: Deque[Tuple[str, Future]] = deque()
+
+
+def _queue_auto_save(state: AgentState, node_name: str) -> None:
+    """
+    Snapshot the project fields a node changed and queue them for writing
+
+    Args:
+        state: Agent state after the node ran
+        node_name: Node that just completed (for log messages)
+    """
+    project_id = state["project_id"]
+    project_data = state_to_project_dict(state, include_knowledge_facts=True)
+    changed, _auto_saved_fields[project_id] = ProjectPersistence.diff_project_fields(
+        project_data, _auto_saved_fields.get(project_id, {})
+    )
+    if changed:
+        _pending_auto_saves.append(
+            (project_id, _auto_save_executor.submit(_write_auto_save, project_id, changed, node_name))
+        )
+
+
+def _write_auto_save(
+    project_id: str,
+    changed: Dict[str, Any],
+    node_name: str
+) -> Tuple[str, str, List[str]]:
+    """
+    Write queued auto-save fields (runs on the auto-save thread)
+
+    Returns:
+        (status message, log level, fields that were not written) for the
+        main thread to handle
+    """
+    fields = list(changed)
+    try:
+        ProjectPersistence.save_project({"project_id": project_id, **changed})
+        return f"✓ Auto-saved state after {node_name}", "info", []
+    except Exception as save_error:
+        # Try without knowledge_facts if schema not updated
+        if "knowledge_facts" in str(save_error):
+            changed.pop("knowledge_facts", None)
+            try:
+                ProjectPersistence.save_project({"project_id": project_id, **changed})
+                # knowledge_facts was not written, so send it again next time
+                return (
+                    f"✓ Auto-saved state after {node_name} (without knowledge_facts)",
+                    "info",
+                    ["knowledge_facts"],
+                )
+            except Exception as retry_error:
+                save_error = retry_error
+        return f"⚠ Auto-save failed: {str(save_error)}", "warning", fields
+
+
+def _log_auto_saves(wait: bool = False) -> None:
+    """
+    Log the status of finished auto-saves, in the order they were queued
+
+    Args:
+        wait: Block until every queued auto-save has been written
+    """
+    tracker = get_progress_tracker()
+    while _pending_auto_saves and (wait or _pending_auto_saves[0][1].done()):
+        project_id, future = _pending_auto_saves.popleft()
+        message, level, unsaved = future.result()
+        if unsaved:
+            # These fields never reached the database; forget them so the
+            # next auto-save sends them again
+            saved_fields = _auto_saved_fields.get(project_id, {})
+            for field in unsaved:
+                saved_fields.pop(field, None)
+        tracker.log_message(message, level)
+
+
+def wait_for_auto_saves() -> None:
+    """Block until every queued auto-save has been written (and log them)"""
+    _log_auto_saves(wait=True)
+
 
 def track_node(func):
     """
@@ -29,6 +128,9 @@ def track_node(func):
         state["current_executing_node"] = node_name
         state["flow_status"] = "in_progress"
 
+        # Report auto-saves that finished while the previous node ran
+        _log_auto_saves()
+
         # Start tracking
         tracker.node_start(node_name)
 
@@ -54,21 +156,7 @@ def track_node(func):
 
             # Auto-save state after each node (except save_state_node to avoid double-save)
             if node_name != "save_state" and result.get("project_id"):
-                try:
-                    project_data = state_to_project_dict(result, include_knowledge_facts=True)
-                    ProjectPersistence.save_project(project_data)
-                    tracker.log_message(f"✓ Auto-saved state after {node_name}", "info")
-                except Exception as save_error:
-                    # Try without knowledge_facts if schema not updated
-                    if "knowledge_facts" in str(save_error):
-                        try:
-                            project_data = state_to_project_dict(result, include_knowledge_facts=False)
-                            ProjectPersistence.save_project(project_data)
-                            tracker.log_message(f"✓ Auto-saved state after {node_name} (without knowledge_facts)", "info")
-                        except Exception as retry_error:
-                            tracker.log_message(f"⚠ Auto-save failed: {str(retry_error)}", "warning")
-                    else:
-                        tracker.log_message(f"⚠ Auto-save failed: {str(save_error)}", "warning")
+                _queue_auto_save(result, node_name)
 
             return result
 
@@ -78,9 +166,11 @@ def track_node(func):
             state["current_executing_node"] = None
             state["errors"].append(f"{node_name} failed: {str(e)}")
 
-            # Try to save failed state
+            # Try to save failed state (after any queued auto-saves, so it lands last)
             try:
+                wait_for_auto_saves()
                 project_data = state_to_project_dict(state, include_knowledge_facts=False)
+                _auto_saved_fields.pop(project_data["project_id"], None)
                 ProjectPersistence.save_project(project_data)
                 tracker.log_message(f"✓ Saved failed state after {node_name}", "info")
             except Exception as save_error:
@@ -106,8 +196,10 @@ def load_context_node(state: AgentState) -> AgentState:
     """
     project_id = state["project_id"]
 
-    # Try to load project from database
-    project_data = ProjectPersistence.load_project(project_id)
+    # Use the row the CLI loaded at startup, or load project from database.
+    # Consumed here so a later pass through this node reads fresh data.
+    project_data = state.get("preloaded_project") or ProjectPersistence.load_project(project_id)
+    state["preloaded_project"] = None
 
     if project_data:
         # Project exists, load it into state
@@ -164,126 +256,264 @@ def load_context_node(state: AgentState) -> AgentState:
     return state
 
 
-@track_node
-def analyze_files_node(state: AgentState) -> AgentState:
+# Most uploaded files analyzed at once by analyze_files_node
+MAX_FILE_WORKERS = 8
+
+# Bump when the cached strategy format changes, so insights cached by older
+# code are regenerated instead of reused
+INSIGHTS_CACHE_VERSION = "1"
+
+# Days cached insights stay valid before the file is re-analyzed
+INSIGHTS_CACHE_TTL_DAYS = 30
+
+
+def _insights_cache_is_current(insights_cache: Dict[str, Any]) -> bool:
     """
-    Analyze uploaded files - check cache first, download from storage if needed
+    Check that cached insights were written by this cache version within the TTL
 
     Args:
-        state: Current agent state (uploaded_files contains storage_path + original_filename)
+        insights_cache: insights_cache value of a file record
 
     Returns:
-        Updated state with file analyses
+        True if the cached insights can be reused
     """
-    from ..database.file_persistence import FilePersistence
-    from ..storage.file_manager import download_file
-
-    project_id = state["project_id"]
-    analyses = []
+    if insights_cache.get("strategy_version") != INSIGHTS_CACHE_VERSION:
+        return False
 
     try:
-        for file_info in state["uploaded_files"]:
-            storage_path = file_info["storage_path"]
-            original_filename = file_info["original_filename"]
+        generated_at = datetime.fromisoformat(insights_cache["generated_at"])
+    except (KeyError, TypeError, ValueError):
+        return False
+    if generated_at.tzinfo is not None:
+        # Compare offset-aware timestamps as naive UTC, like datetime.utcnow()
+        generated_at = generated_at.astimezone(timezone.utc).replace(tzinfo=None)
+
+    return datetime.utcnow() - generated_at < timedelta(days=INSIGHTS_CACHE_TTL_DAYS)
+
 
-            # Check if file analysis is cached in database
+def _analyze_uploaded_file(
+    project_id: str,
+    file_info: Dict[str, Any]
+) -> Tuple[Dict[str, Any], List[str], Optional[Dict[str, Any]]]:
+    """
+    Analyze one uploaded file - check cache first, download from storage if needed
+
+    Args:
+        project_id: UUID of the project
+        file_info: Uploaded file (storage_path + original_filename, and
+            content_hash when hashed at upload)
+
+    Returns:
+        (analysis, log messages, file record to save or None if already stored)
+    """
+    messages = []
+    record = None
+
+    storage_path = file_info["storage_path"]
+    original_filename = file_info["original_filename"]
+    content_hash = file_info.get("content_hash")
+
+    # Check if file analysis is cached in database. Files hashed at upload are
+    # looked up by contents: a renamed copy reuses the cache, while a file
+    # overwritten under the same name does not.
+    if content_hash:
+        try:
+            cached_record = FilePersistence.get_file_record_by_hash(project_id, content_hash)
+        except Exception as e:
+            if "content_hash" not in str(e):
+                raise
+            # Database without the content_hash migration - look the file up
+            # by storage_path, as before files were hashed
             cached_record = FilePersistence.get_file_record(project_id, storage_path)
+    else:
+        cached_record = FilePersistence.get_file_record(project_id, storage_path)
+
+    if cached_record and cached_record.get("file_metadata") and cached_record.get("file_type"):
+        if cached_record["storage_path"] != storage_path:
+            # Same contents under a new name - record it so insight_node can
+            # cache insights for this path too
+            record = {
+                "project_id": project_id,
+                "storage_path": storage_path,
+                "original_filename": original_filename,
+                "file_type": cached_record["file_type"],
+                "file_metadata": cached_record["file_metadata"],
+                "content_hash": content_hash,
+                "insights_cache": cached_record.get("insights_cache"),
+            }
 
-            if cached_record and cached_record.get("file_metadata") and cached_record.get("file_type"):
-                # Cache hit - check if we have cached insights or need to reload data
-                insights_cache = cached_record.get("insights_cache")
-                has_cached_insights = insights_cache is not None
-
-                # Validate cached insights are not empty
-                if has_cached_insights:
-                    strategy = insights_cache.get("strategy", {})
-                    insights = strategy.get("insights", {})
-                    patterns = insights.get("patterns", [])
-
-                    # Check if insights contain actual data (not generic "no data" messages)
-                    has_valid_insights = (
-                        len(patterns) > 0
-                        and "No historical campaign data" not in str(patterns)
-                    )
+        # Cache hit - check if we have cached insights or need to reload data
+        insights_cache = cached_record.get("insights_cache")
+        has_cached_insights = insights_cache is not None
 
-                    if not has_valid_insights:
-                        has_cached_insights = False
-                        state["messages"].append(f"⚠ Cached insights for {original_filename} are empty - will reload data")
-
-                if has_cached_insights:
-                    # Full cache hit with valid insights - use cached analysis without data
-                    analysis = {
-                        "file_path": storage_path,
-                        "file_name": original_filename,
-                        "type": cached_record["file_type"],
-                        "row_count": cached_record["file_metadata"].get("row_count", 0),
-                        "columns": cached_record["file_metadata"].get("columns", []),
-                        "metrics": cached_record["file_metadata"].get("metrics", {}),
-                        "data": [],  # Don't load full data when insights are cached
-                        "cached": True,
-                        "insights_cache": cached_record.get("insights_cache")
-                    }
-                    state["messages"].append(f"✓ Using cached analysis for {original_filename}")
+        # Validate cached insights are not empty
+        if has_cached_insights:
+            strategy = insights_cache.get("strategy", {})
+            insights = strategy.get("insights", {})
+            patterns = insights.get("patterns", [])
 
-                else:
-                    # Partial cache hit - we have metadata but need to reload data for insights
-                    state["messages"].append(
-                        f"Reloading {original_filename} data for insight generation..."
-                    )
+            # Check if insights contain actual data (not generic "no data" messages)
+            has_valid_insights = (
+                len(patterns) > 0
+                and "No historical campaign data" not in str(patterns)
+            )
 
-                    # Download file from storage to /tmp
-                    local_path = download_file(storage_path)
+            if not has_valid_insights:
+                has_cached_insights = False
+                messages.append(f"⚠ Cached insights for {original_filename} are empty - will reload data")
+            elif not _insights_cache_is_current(insights_cache):
+                has_cached_insights = False
+                messages.append(f"⚠ Cached insights for {original_filename} are outdated - will reload data")
+
+        if has_cached_insights:
+            # Full cache hit with valid insights - use cached analysis without data
+            analysis = {
+                "file_path": storage_path,
+                "file_name": original_filename,
+                "type": cached_record["file_type"],
+                "row_count": cached_record["file_metadata"].get("row_count", 0),
+                "columns": cached_record["file_metadata"].get("columns", []),
+                "metrics": cached_record["file_metadata"].get("metrics", {}),
+                "data": [],  # Don't load full data when insights are cached
+                "cached": True,
+                "insights_cache": cached_record.get("insights_cache")
+            }
+            messages.append(f"✓ Using cached analysis for {original_filename}")
 
-                    # Analyze file to get full data
-                    analysis = DataLoader.analyze_file(local_path)
-                    analysis["cached"] = False
+        else:
+            # Partial cache hit - we have metadata but need to reload data for insights
+            messages.append(
+                f"Reloading {original_filename} data for insight generation..."
+            )
 
-                    state["messages"].append(
-                        f"✓ Reloaded {original_filename}: "
-                        f"{analysis['type']}, {analysis['row_count']} rows"
-                    )
+            # Download file from storage to /tmp
+            local_path = download_file(storage_path)
 
-            else:
-                # Cache miss - download and analyze
-                state["messages"].append(f"Downloading and analyzing {original_filename}...")
-
-                # Download file from storage to /tmp
-                local_path = download_file(storage_path)
-
-                # Analyze file
-                analysis = DataLoader.analyze_file(local_path)
-                analysis["cached"] = False
-
-                # Save metadata and file_type to database
-                FilePersistence.upsert_file_record(
-                    project_id=project_id,
-                    storage_path=storage_path,
-                    original_filename=original_filename,
-                    file_type=analysis.get("type"),
-                    file_metadata={
-                        "row_count": analysis.get("row_count"),
-                        "columns": analysis.get("columns", []),
-                        "metrics": analysis.get("metrics", {}),
-                    }
-                )
+            # Analyze file to get full data
+            analysis = DataLoader.analyze_file(local_path)
+            analysis["cached"] = False
 
-                state["messages"].append(
-                    f"✓ Analyzed {original_filename}: "
-                    f"{analysis['type']}, {analysis['row_count']} rows"
-                )
+            messages.append(
+                f"✓ Reloaded {original_filename}: "
+                f"{analysis['type']}, {analysis['row_count']} rows"
+            )
+
+    else:
+        # Cache miss - download and analyze
+        messages.append(f"Downloading and analyzing {original_filename}...")
+
+        # Download file from storage to /tmp
+        local_path = download_file(storage_path)
+
+        # Analyze file
+        analysis = DataLoader.analyze_file(local_path)
+        analysis["cached"] = False
+
+        # Metadata and file_type are saved by analyze_files_node, in one
+        # request for all new files
+        record = {
+            "project_id": project_id,
+            "storage_path": storage_path,
+            "original_filename": original_filename,
+            "file_type": analysis.get("type"),
+            "file_metadata": {
+                "row_count": analysis.get("row_count"),
+                "columns": analysis.get("columns", []),
+                "metrics": analysis.get("metrics", {}),
+            },
+            "content_hash": content_hash,
+            # Insights cached for earlier contents at this path are stale
+            "insights_cache": None,
+        }
+
+        messages.append(
+            f"✓ Analyzed {original_filename}: "
+            f"{analysis['type']}, {analysis['row_count']} rows"
+        )
+
+    return analysis, messages, record
+
+
+@track_node
+def analyze_files_node(state: AgentState) -> AgentState:
+    """
+    Analyze uploaded files - check cache first, download from storage if needed
+
+    Args:
+        state: Current agent state (uploaded_files contains storage_path + original_filename)
 
-            analyses.append(analysis)
+    Returns:
+        Updated state with file analyses
+    """
+    project_id = state["project_id"]
+    uploaded_files = state["uploaded_files"]
+    analyses = []
+    new_records = []
+
+    try:
+        # Downloads and file reads are I/O-bound, so files are analyzed in
+        # parallel; results (and their log lines) are collected in upload order
+        workers = max(1, min(MAX_FILE_WORKERS, len(uploaded_files)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                lambda file_info: _analyze_uploaded_file(project_id, file_info),
+                uploaded_files
+            )
+
+            for analysis, messages, record in results:
+                state["messages"].extend(messages)
+                if record:
+                    new_records.append(record)
+                analyses.append(analysis)
 
         state["file_analyses"] = analyses
 
     except Exception as e:
         state["errors"].append(f"File analysis error: {str(e)}")
 
+    # Save records for the new files in one request (including those
+    # analyzed before a later file failed)
+    try:
+        FilePersistence.upsert_file_records(new_records)
+    except Exception as e:
+        # Try without content_hash if schema not updated
+        if "content_hash" in str(e):
+            try:
+                FilePersistence.upsert_file_records([
+                    {field: value for field, value in record.items() if field != "content_hash"}
+                    for record in new_records
+                ])
+            except Exception as retry_error:
+                state["errors"].append(f"File analysis error: {str(retry_error)}")
+        else:
+            state["errors"].append(f"File analysis error: {str(e)}")
+
     state["cycle_num"] += 1
 
     return state
 
 
+# Bump when the inference prompt changes, so facts inferred with the old prompt
+# are not reused by infer_facts_from_data
+INFERENCE_PROMPT_VERSION = "2"
+
+INFERENCE_PROMPT_TEMPLATE = """
+Analyze these campaign data samples and infer:
+1. Product type/category
+2. Target audience hints
+3. Likely business goals
+
+Data: {data}
+
+Respond with JSON:
+{{
+  "product_type": "description",
+  "audience_hint": "description",
+  "business_goals": "description"
+}}
+"""
+
+
 def infer_facts_from_data(state: AgentState) -> Dict[str, Dict[str, Any]]:
     """
     Use LLM to infer facts from historical campaign data in file_analyses
@@ -294,47 +524,46 @@ def infer_facts_from_data(state: AgentState) -> Dict[str, Dict[str, Any]]:
     Returns:
         Dictionary of inferred facts with confidence scores
     """
-    from ..llm.gemini import get_gemini
-    import json
-
     facts = {}
 
     # Get data from file_analyses (populated by analyze_files_node)
     file_analyses = state.get("file_analyses", [])
 
-    # Collect all historical campaign data
-    all_data = []
-    for analysis in file_analyses:
-        if analysis.get("type") == "historical" and analysis.get("data"):
-            all_data.extend(analysis["data"])
+    # Historical campaign rows, per file
+    historical_rows = [
+        analysis["data"] for analysis in file_analyses
+        if analysis.get("type") == "historical" and analysis.get("data")
+    ]
+    record_count = sum(len(rows) for rows in historical_rows)
 
-    if not all_data or len(all_data) == 0:
+    if record_count == 0:
         state.get("messages", []).append("⚠ No historical data available for LLM inference")
         return facts
 
-    state.get("messages", []).append(f"🔍 Analyzing {len(all_data)} campaign records for inference...")
+    state.get("messages", []).append(f"🔍 Analyzing {record_count} campaign records for inference...")
 
-    try:
-        gemini = get_gemini()
+    # Sample first 5 campaigns for inference (without concatenating every file)
+    sample = list(islice(chain.from_iterable(historical_rows), 5))
 
-        # Sample first 5 campaigns for inference
-        sample = all_data[:5]
-
-        inference_prompt = f"""
-Analyze these campaign data samples and infer:
-1. Product type/category
-2. Target audience hints
-3. Likely business goals
+    # Reuse facts a previous session inferred from the same sample and prompt
+    fingerprint = hashlib.sha256(
+        (INFERENCE_PROMPT_VERSION + json.dumps(sample, sort_keys=True, default=str)).encode()
+    ).hexdigest()
+    cached_facts = {
+        key: fact for key, fact in state.get("knowledge_facts", {}).items()
+        if fact.get("source") == "llm_inference" and fact.get("data_fingerprint") == fingerprint
+    }
+    if cached_facts:
+        state.get("messages", []).append("✓ Data unchanged since last inference - reusing inferred facts")
+        return cached_facts
 
-Data: {json.dumps(sample, indent=2)}
+    try:
+        gemini = get_gemini()
 
-Respond with JSON:
-{{
-  "product_type": "description",
-  "audience_hint": "description",
-  "business_goals": "description"
-}}
-"""
+        # Compact JSON keeps the sample's token count down
+        inference_prompt = INFERENCE_PROMPT_TEMPLATE.format(
+            data=json.dumps(sample, separators=(",", ":"))
+        )
 
         result = gemini.generate_json(
             prompt=inference_prompt,
@@ -346,21 +575,24 @@ Respond with JSON:
             facts["product_category"] = {
                 "value": result["product_type"],
                 "confidence": 0.7,
-                "source": "llm_inference"
+                "source": "llm_inference",
+                "data_fingerprint": fingerprint
             }
 
         if result.get("audience_hint"):
             facts["audience_hint"] = {
                 "value": result["audience_hint"],
                 "confidence": 0.6,
-                "source": "llm_inference"
+                "source": "llm_inference",
+                "data_fingerprint": fingerprint
             }
 
         if result.get("business_goals"):
             facts["business_goals"] = {
                 "value": result["business_goals"],
                 "confidence": 0.5,
-                "source": "llm_inference"
+                "source": "llm_inference",
+                "data_fingerprint": fingerprint
             }
 
     except Exception as e:
@@ -369,6 +601,35 @@ Respond with JSON:
     return facts
 
 
+@lru_cache(maxsize=1)
+def get_tavily(api_key: str) -> TavilyClient:
+    """
+    Get or create the Tavily client for an API key (one per process)
+
+    Args:
+        api_key: Tavily API key
+
+    Returns:
+        TavilyClient instance
+    """
+    return TavilyClient(api_key=api_key)
+
+
+# Discovery web searches, stored in knowledge_facts as market_<key>
+WEB_SEARCH_QUERIES = {
+    "competitors": "{product} competitors advertising strategies",
+    "benchmarks": "{product} advertising CPA ROAS benchmarks industry standards",
+}
+
+
+def _web_search_product(state: AgentState) -> str:
+    """Product description used in web search queries (knowledge_facts first, then user_inputs)"""
+    product = state.get("knowledge_facts", {}).get("product_description", {}).get("value")
+    if not product:
+        product = state.get("user_inputs", {}).get("product_description", "")
+    return product
+
+
 def parallel_web_search(state: AgentState) -> Dict[str, Dict[str, Any]]:
     """
     Execute multiple Tavily searches concurrently
@@ -379,30 +640,23 @@ def parallel_web_search(state: AgentState) -> Dict[str, Dict[str, Any]]:
     Returns:
         Dictionary of web search results with confidence scores
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-
     facts = {}
     tavily_key = os.getenv("TAVILY_API_KEY")
 
     if not tavily_key:
         return facts
 
-    # Get product description from knowledge_facts or user_inputs
-    product = state.get("knowledge_facts", {}).get("product_description", {}).get("value")
-    if not product:
-        product = state.get("user_inputs", {}).get("product_description", "")
-
+    product = _web_search_product(state)
     if not product:
         return facts
 
     try:
-        from tavily import TavilyClient
-        tavily = TavilyClient(api_key=tavily_key)
+        tavily = get_tavily(tavily_key)
 
         # Define search queries
         searches = {
-            "competitors": f"{product} competitors advertising strategies",
-            "benchmarks": f"{product} advertising CPA ROAS benchmarks industry standards"
+            key: template.format(product=product)
+            for key, template in WEB_SEARCH_QUERIES.items()
         }
 
         # Execute searches in parallel
@@ -529,6 +783,23 @@ def ask_user_batch(missing_keys: list, state: AgentState) -> Dict[str, Dict[str,
     return facts
 
 
+def _preview(value: Any, limit: int = 50) -> str:
+    """
+    One-line preview of a fact value for the discovery log
+
+    Args:
+        value: Fact value
+        limit: Maximum characters before "..."
+
+    Returns:
+        Preview string
+    """
+    # reprlib caps how much of a container is rendered, so long web search
+    # result lists aren't converted to a string in full just to be cut
+    text = value if isinstance(value, str) else reprlib.repr(value)
+    return text[:limit] + "..." if len(text) > limit else text
+
+
 @track_node
 def discovery_node(state: AgentState) -> AgentState:
     """
@@ -562,7 +833,7 @@ def discovery_node(state: AgentState) -> AgentState:
             state["messages"].append(f"  ✓ Extracted {len(url_facts)} facts from URL(s)")
             for key, fact in url_facts.items():
                 if key != 'source_url':  # Don't log the source URL itself
-                    value_preview = str(fact['value'])[:50] + "..." if len(str(fact['value'])) > 50 else str(fact['value'])
+                    value_preview = _preview(fact['value'])
                     state["messages"].append(f"    - {key}: {value_preview} (conf: {fact['confidence']:.2f})")
         else:
             state["messages"].append("  ⊘ No facts extracted from URLs")
@@ -570,6 +841,15 @@ def discovery_node(state: AgentState) -> AgentState:
         state["messages"].append("\n[Strategy 0/4] Product URL Analysis")
         state["messages"].append("  ⊘ No URLs provided")
 
+    # Strategy 2 is a silent network call (Tavily) that needs nothing from
+    # Strategies 1 or 3, so the web search runs in the background while the
+    # LLM inference and the user questions run here. It logs into its own
+    # list, appended under its header once it finishes.
+    web_messages = []
+    executor = ThreadPoolExecutor(max_workers=1)
+    web_future = executor.submit(parallel_web_search, {**state, "messages": web_messages})
+    executor.shutdown(wait=False)
+
     # Strategy 1: LLM Inference from historical data
     state["messages"].append("\n[Strategy 1/4] LLM Inference from Historical Data")
     inferred = infer_facts_from_data(state)
@@ -579,30 +859,23 @@ def discovery_node(state: AgentState) -> AgentState:
         avg_conf = sum(f['confidence'] for f in inferred.values())/len(inferred)
         state["messages"].append(f"  ✓ Inferred {len(inferred)} facts (avg confidence: {avg_conf:.2f})")
         for key, fact in inferred.items():
-            value_preview = str(fact['value'])[:50] + "..." if len(str(fact['value'])) > 50 else str(fact['value'])
+            value_preview = _preview(fact['value'])
             state["messages"].append(f"    - {key}: {value_preview} (conf: {fact['confidence']:.2f})")
     else:
         state["messages"].append("  ⊘ No facts inferred")
 
-    # Strategy 2: Parallel Web Search
-    state["messages"].append("\n[Strategy 2/4] Parallel Web Search")
-    web_facts = parallel_web_search(state)
-
-    if web_facts:
-        knowledge.update(web_facts)
-        state["messages"].append(f"  ✓ Found {len(web_facts)} facts from web")
-        for key in web_facts.keys():
-            state["messages"].append(f"    - {key}")
-    else:
-        # Check why web search didn't run
-        product = knowledge.get("product_description", {}).get("value") or state.get("user_inputs", {}).get("product_description")
-        if not product:
-            state["messages"].append("  ⊘ Web search skipped (no product description yet)")
-        else:
-            state["messages"].append("  ⊘ Web search skipped (no Tavily API key)")
-
-    # Strategy 3: User Questions (only for critical missing facts)
-    state["messages"].append("\n[Strategy 3/4] User Input for Critical Facts")
+    # Why the web search would have been skipped, judged before the user
+    # answers (the search itself only sees the facts known at the start)
+    product_known = bool(
+        knowledge.get("product_description", {}).get("value")
+        or state.get("user_inputs", {}).get("product_description")
+    )
+
+    # Strategy 3: User Questions (only for critical missing facts). Web facts
+    # are market_* only and never cover a critical fact, so the questions are
+    # asked without waiting for the search; the section is logged after
+    # Strategy 2 to keep the report in order.
+    user_messages = ["\n[Strategy 3/4] User Input for Critical Facts"]
     critical_facts = ["product_description", "target_budget"]
 
     missing = []
@@ -610,21 +883,41 @@ def discovery_node(state: AgentState) -> AgentState:
         existing_conf = knowledge.get(key, {}).get("confidence", 0)
         if key not in knowledge or existing_conf < 0.6:
             missing.append(key)
-            state["messages"].append(f"  ? {key} needed (current confidence: {existing_conf:.2f}, threshold: 0.60)")
+            user_messages.append(f"  ? {key} needed (current confidence: {existing_conf:.2f}, threshold: 0.60)")
 
+    user_facts = {}
     if not missing:
-        state["messages"].append("  ✓ All critical facts already known")
+        user_messages.append("  ✓ All critical facts already known")
     elif not interactive_mode:
-        state["messages"].append("  ⊘ Interactive mode disabled, skipping user questions")
+        user_messages.append("  ⊘ Interactive mode disabled, skipping user questions")
     else:
         user_facts = ask_user_batch(missing, state)
-        knowledge.update(user_facts)
         if user_facts:
-            state["messages"].append(f"  ✓ User provided {len(user_facts)} facts")
+            user_messages.append(f"  ✓ User provided {len(user_facts)} facts")
             for key in user_facts.keys():
-                state["messages"].append(f"    - {key}")
+                user_messages.append(f"    - {key}")
         else:
-            state["messages"].append("  ⊘ User skipped all questions")
+            user_messages.append("  ⊘ User skipped all questions")
+
+    # Strategy 2: Parallel Web Search
+    state["messages"].append("\n[Strategy 2/4] Parallel Web Search")
+    web_facts = web_future.result()
+    state["messages"].extend(web_messages)
+
+    if web_facts:
+        knowledge.update(web_facts)
+        state["messages"].append(f"  ✓ Found {len(web_facts)} facts from web")
+        for key in web_facts.keys():
+            state["messages"].append(f"    - {key}")
+    else:
+        # Check why web search didn't run
+        if not product_known:
+            state["messages"].append("  ⊘ Web search skipped (no product description yet)")
+        else:
+            state["messages"].append("  ⊘ Web search skipped (no Tavily API key)")
+
+    knowledge.update(user_facts)
+    state["messages"].extend(user_messages)
 
     # Final Summary
     state["messages"].append("\n" + "="*60)
@@ -642,7 +935,7 @@ def discovery_node(state: AgentState) -> AgentState:
 
         state["messages"].append("\nKnowledge Graph:")
         for key, fact in knowledge.items():
-            value_str = str(fact['value'])[:40] + "..." if len(str(fact['value'])) > 40 else str(fact['value'])
+            value_str = _preview(fact['value'], 40)
             state["messages"].append(
                 f"  {key:25} {value_str:42} "
                 f"[conf: {fact['confidence']:.2f}, src: {fact['source']}]"
@@ -677,112 +970,14 @@ def user_input_node(state: AgentState) -> AgentState:
     DEPRECATED: Use discovery_node instead
     This node is kept for backward compatibility but redirects to discovery_node
 
-    Collect additional user inputs and perform targeted web search
-
     Args:
         state: Current agent state
 
     Returns:
-        Updated state with user inputs and search results
+        Updated state from discovery_node
     """
-    # Redirect to discovery_node
     return discovery_node(state)
 
-    # Old implementation below (never reached)
-    # Check if we're in CLI mode (interactive) or programmatic mode
-    # For now, we'll make interactive prompts optional
-    interactive_mode = os.getenv("INTERACTIVE_MODE", "true").lower() == "true"
-
-    # Collect missing critical fields
-    user_inputs = state.get("user_inputs", {})
-
-    if interactive_mode:
-        print("\n--- Additional Context (optional) ---")
-
-        # Product description
-        if not user_inputs.get("product_description"):
-            response = input("Product description (press Enter to skip): ").strip()
-            if response:
-                user_inputs["product_description"] = response
-
-        # Target budget
-        if not user_inputs.get("target_budget"):
-            response = input("Target daily budget in USD (press Enter to skip): ").strip()
-            if response:
-                try:
-                    user_inputs["target_budget"] = float(response)
-                except ValueError:
-                    state["messages"].append("Invalid budget format, using default")
-
-        # Target CPA
-        if not user_inputs.get("target_cpa"):
-            response = input("Target CPA in USD (press Enter to skip): ").strip()
-            if response:
-                try:
-                    user_inputs["target_cpa"] = float(response)
-                except ValueError:
-                    state["messages"].append("Invalid CPA format")
-
-        # Target ROAS
-        if not user_inputs.get("target_roas"):
-            response = input("Target ROAS (press Enter to skip): ").strip()
-            if response:
-                try:
-                    user_inputs["target_roas"] = float(response)
-                except ValueError:
-                    state["messages"].append("Invalid ROAS format")
-
-        print()
-
-    # Update state with collected inputs
-    state["user_inputs"] = user_inputs
-
-    # Conditional web search based on decision type
-    decision = state.get("decision", "")
-    tavily_key = os.getenv("TAVILY_API_KEY")
-
-    if tavily_key:
-        try:
-            from tavily import TavilyClient
-            tavily = TavilyClient(api_key=tavily_key)
-
-            # For 'enrich' decision: Search for competitive intelligence
-            if decision == "enrich":
-                product_desc = user_inputs.get("product_description", "")
-                if product_desc:
-                    search_query = f"{product_desc} competitor advertising strategies best practices"
-                    results = tavily.search(query=search_query, max_results=3)
-                    if "competitive_intel" not in state["market_data"]:
-                        state["market_data"]["competitive_intel"] = []
-                    state["market_data"]["competitive_intel"].append({
-                        "query": search_query,
-                        "results": results.get("results", [])
-                    })
-                    state["messages"].append("Collected competitive intelligence via web search")
-
-            # For 'reflect' decision: Search for optimization tactics
-            elif decision == "reflect":
-                # Get underperforming platforms from previous analysis
-                best_performers = state.get("best_performers", {})
-                if best_performers:
-                    # Search for platform-specific optimization tactics
-                    search_query = f"advertising optimization tactics improve CPA ROAS {best_performers.get('best_platform', 'digital')}"
-                    results = tavily.search(query=search_query, max_results=3)
-                    if "optimization_intel" not in state["market_data"]:
-                        state["market_data"]["optimization_intel"] = []
-                    state["market_data"]["optimization_intel"].append({
-                        "query": search_query,
-                        "results": results.get("results", [])
-                    })
-                    state["messages"].append("Collected optimization tactics via web search")
-
-        except Exception as e:
-            state["messages"].append(f"Web search skipped: {str(e)}")
-
-    state["cycle_num"] += 1
-
-    return state
-
 
 @track_node
 def data_collection_node(state: AgentState) -> AgentState:
@@ -845,13 +1040,20 @@ def data_collection_node(state: AgentState) -> AgentState:
     # Web search for market benchmarks (simplified)
     try:
         tavily_key = os.getenv("TAVILY_API_KEY")
-        if tavily_key and not state.get("market_data", {}).get("benchmarks"):
-            tavily = TavilyClient(api_key=tavily_key)
-
-            # Search for market benchmarks based on product
-            product_desc = state.get("user_inputs", {}).get("product_description", "")
-            if product_desc:
-                search_query = f"{product_desc} advertising benchmarks CPA CTR ROAS"
+        product_desc = _web_search_product(state)
+        if product_desc and not state.get("market_data", {}).get("benchmarks"):
+            # Same query discovery's parallel_web_search sends for benchmarks
+            search_query = WEB_SEARCH_QUERIES["benchmarks"].format(product=product_desc)
+            web_benchmarks = state.get("knowledge_facts", {}).get("market_benchmarks")
+            if web_benchmarks and web_benchmarks.get("source") == "web_search":
+                # Discovery already searched for benchmarks; reuse its results
+                state["market_data"]["benchmarks"] = {
+                    "search_query": search_query,
+                    "results": web_benchmarks["value"],
+                }
+                state["messages"].append("Reused market benchmarks from discovery web search")
+            elif tavily_key:
+                tavily = get_tavily(tavily_key)
                 results = tavily.search(query=search_query, max_results=3)
 
                 state["market_data"]["benchmarks"] = {
@@ -899,12 +1101,17 @@ def merge_cached_insights(cached_files: list) -> Dict[str, Any]:
     return cached_strategy
 
 
-def extract_cached_context(cached_files: list) -> str:
+# Most patterns/strengths/weaknesses per file passed on as cached context
+CACHED_CONTEXT_MAX_ITEMS = 5
+
+
+def extract_cached_context(cached_files: list, limit: int = CACHED_CONTEXT_MAX_ITEMS) -> str:
     """
     Extract key learnings from cached insights for LLM context
 
     Args:
         cached_files: List of file analyses with insights_cache
+        limit: Maximum items listed per insight category
 
     Returns:
         Formatted string of previous insights
@@ -913,6 +1120,7 @@ def extract_cached_context(cached_files: list) -> str:
         return "No previous insights available"
 
     context_parts = []
+    seen_insights = set()
 
     for file_analysis in cached_files:
         insights_cache = file_analysis.get("insights_cache", {})
@@ -922,10 +1130,16 @@ def extract_cached_context(cached_files: list) -> str:
             # Extract key points from cached strategy
             insights = strategy.get("insights", {})
             if insights:
+                # Files uploaded together cache the same strategy; list it once
+                insights_key = json.dumps(insights, sort_keys=True, default=str)
+                if insights_key in seen_insights:
+                    continue
+                seen_insights.add(insights_key)
+
                 context_parts.append(f"Previous insights from {file_analysis.get('file_name', 'file')}:")
-                context_parts.append(f"- Patterns: {insights.get('patterns', [])}")
-                context_parts.append(f"- Strengths: {insights.get('strengths', [])}")
-                context_parts.append(f"- Weaknesses: {insights.get('weaknesses', [])}")
+                context_parts.append(f"- Patterns: {list(islice(insights.get('patterns', []), limit))}")
+                context_parts.append(f"- Strengths: {list(islice(insights.get('strengths', []), limit))}")
+                context_parts.append(f"- Weaknesses: {list(islice(insights.get('weaknesses', []), limit))}")
 
     return "\n".join(context_parts) if context_parts else "No previous insights available"
 
@@ -942,8 +1156,6 @@ def insight_node(state: AgentState) -> AgentState:
     Returns:
         Updated state with strategy
     """
-    from ..database.file_persistence import FilePersistence
-
     try:
         # Categorize files: cached vs new
         cached_files = []
@@ -1000,23 +1212,20 @@ def insight_node(state: AgentState) -> AgentState:
 
         # Cache insights back to uploaded_files for future sessions
         # This allows reuse of insights without re-analyzing same files
-        project_id = state["project_id"]
-        for file_info in state["uploaded_files"]:
-            storage_path = file_info["storage_path"]
-
-            # Cache the full strategy as insights for this file
-            # In a more sophisticated implementation, could extract file-specific insights
-            insights_to_cache = {
-                "strategy": strategy,
-                "execution_timeline": state["experiment_plan"],
-                "generated_at": None,  # Will be set by database
-            }
+        # Every file caches the full strategy, so all rows are updated in one request
+        # In a more sophisticated implementation, could extract file-specific insights
+        insights_to_cache = {
+            "strategy": strategy,
+            "execution_timeline": state["experiment_plan"],
+            "generated_at": datetime.utcnow().isoformat(),
+            "strategy_version": INSIGHTS_CACHE_VERSION,
+        }
 
-            FilePersistence.cache_file_insights(
-                project_id=project_id,
-                storage_path=storage_path,
-                insights=insights_to_cache
-            )
+        FilePersistence.cache_file_insights_bulk(
+            project_id=state["project_id"],
+            storage_paths=[file_info["storage_path"] for file_info in state["uploaded_files"]],
+            insights=insights_to_cache
+        )
 
         state["messages"].append("Cached insights for future sessions")
 
@@ -1181,6 +1390,9 @@ def save_state_node(state: AgentState) -> AgentState:
     Returns:
         Updated state
     """
+    # Let queued auto-saves finish first so they can't overwrite the final state
+    wait_for_auto_saves()
+
     try:
         # Try to save with knowledge_facts
         project_data = state_to_project_dict(state, include_knowledge_facts=True)
@@ -34,6 +34,7 @@ class AgentState(TypedDict):
     current_executing_node: Optional[str]  # Currently executing node
     is_resuming: bool  # Whether this is a resumed flow
     force_restart: bool  # CLI flag to force restart even if resumption possible
+    preloaded_project: Optional[Dict[str, Any]]  # Project row the CLI already loaded (not persisted)
 
     # ===== Project State (Loaded from DB) =====
     project_loaded: bool  # Whether project was loaded from DB
@@ -112,6 +113,7 @@ def create_initial_state(
         current_executing_node=None,
         is_resuming=False,
         force_restart=False,
+        preloaded_project=None,  # Will be set by CLI for an existing project
 
         # Project state
         project_loaded=False,
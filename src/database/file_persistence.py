@@ -73,6 +73,61 @@ class FilePersistence:
 
         return None
 
+    @staticmethod
+    def get_file_record_by_hash(project_id: str, content_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a file record with the given contents, under any storage_path
+
+        Args:
+            project_id: UUID of the project
+            content_hash: SHA-256 of the file contents
+
+        Returns:
+            File record dict (preferring one with cached insights) or None
+        """
+        db = get_db()
+
+        response = (
+            db.table("uploaded_files")
+            .select("*")
+            .eq("project_id", project_id)
+            .eq("content_hash", content_hash)
+            .execute()
+        )
+
+        if not response.data:
+            return None
+
+        return next(
+            (record for record in response.data if record.get("insights_cache")),
+            response.data[0]
+        )
+
+    @staticmethod
+    def upsert_file_records(records: List[Dict[str, Any]]) -> List[str]:
+        """
+        Insert or update several file records in one request
+
+        Args:
+            records: File record dicts with the same keys (project_id,
+                storage_path, original_filename, file_type, file_metadata,
+                content_hash, insights_cache)
+
+        Returns:
+            file_ids: UUIDs of the records
+        """
+        if not records:
+            return []
+
+        db = get_db()
+
+        # Columns left out of the records keep their values
+        response = db.table("uploaded_files").upsert(
+            records, on_conflict="project_id,storage_path"
+        ).execute()
+
+        return [row["file_id"] for row in response.data]
+
     @staticmethod
     def update_file_analysis(
         project_id: str,
@@ -126,6 +181,49 @@ class FilePersistence:
             "project_id", project_id
         ).eq("storage_path", storage_path).execute()
 
+    @staticmethod
+    def cache_file_insights_bulk(
+        project_id: str,
+        storage_paths: List[str],
+        insights: Dict[str, Any]
+    ) -> None:
+        """
+        Cache the same insights on several files in one request
+
+        Args:
+            project_id: UUID of the project
+            storage_paths: Paths in Supabase Storage
+            insights: Insights dict to cache
+        """
+        if not storage_paths:
+            return
+
+        db = get_db()
+
+        update_data = {
+            "insights_cache": insights,
+            "last_analyzed_at": datetime.utcnow().isoformat(),
+        }
+
+        db.table("uploaded_files").update(update_data).eq(
+            "project_id", project_id
+        ).in_("storage_path", storage_paths).execute()
+
+    @staticmethod
+    def invalidate_insights(project_id: str, storage_path: str) -> None:
+        """
+        Drop a file's cached insights so the next run regenerates them
+
+        Args:
+            project_id: UUID of the project
+            storage_path: Path in Supabase Storage
+        """
+        db = get_db()
+
+        db.table("uploaded_files").update({"insights_cache": None}).eq(
+            "project_id", project_id
+        ).eq("storage_path", storage_path).execute()
+
     @staticmethod
     def get_project_files(project_id: str) -> List[Dict[str, Any]]:
         """
@@ -2,8 +2,9 @@
 Persistence layer for loading and saving project state
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
+import json
 import uuid
 from .client import get_db
 
@@ -80,6 +81,38 @@ class ProjectPersistence:
         # updated_at will be automatically updated by trigger
         db.table("projects").update(project_data).eq("project_id", project_id).execute()
 
+    @staticmethod
+    def diff_project_fields(
+        project_data: Dict[str, Any],
+        saved_fields: Dict[str, str]
+    ) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Find the project fields that changed since the previous save
+
+        Args:
+            project_data: Complete project state dictionary
+            saved_fields: Serialized field values from the previous call
+                (empty to treat every field as changed)
+
+        Returns:
+            (changed fields as detached copies, serialized field values to
+            pass to the next call)
+        """
+        # Compare serialized values, since state lists/dicts are mutated in place
+        current_fields = {
+            field: json.dumps(value, sort_keys=True, default=str)
+            for field, value in project_data.items()
+            if field != "project_id"
+        }
+        # Decode changed values from their encoding so the copy can be written
+        # while the caller keeps mutating the originals
+        changed = {
+            field: json.loads(encoded)
+            for field, encoded in current_fields.items()
+            if saved_fields.get(field) != encoded
+        }
+        return changed, current_fields
+
     @staticmethod
     def update_project_field(project_id: str, field: str, value: Any) -> None:
         """
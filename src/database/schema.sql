@@ -139,6 +139,7 @@ CREATE TABLE uploaded_files (
     storage_path TEXT NOT NULL,
     original_filename TEXT NOT NULL,
     file_type TEXT,  -- 'historical', 'experiment_results', 'enrichment'
+    content_hash TEXT,  -- SHA-256 of the file contents
     uploaded_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
 
     -- Cached analysis results
@@ -154,6 +155,7 @@ CREATE TABLE uploaded_files (
 CREATE INDEX idx_uploaded_files_project_id ON uploaded_files(project_id);
 CREATE INDEX idx_uploaded_files_uploaded_at ON uploaded_files(uploaded_at DESC);
 CREATE INDEX idx_uploaded_files_file_type ON uploaded_files(file_type);
+CREATE INDEX idx_uploaded_files_content_hash ON uploaded_files(project_id, content_hash);
 
 -- Comments for documentation
 COMMENT ON TABLE projects IS 'Main table storing complete campaign state across sessions';
@@ -169,4 +171,5 @@ COMMENT ON COLUMN projects.flow_status IS 'Current flow status: not_started, in_
 COMMENT ON COLUMN projects.current_executing_node IS 'Node currently being executed (for debugging)';
 COMMENT ON COLUMN sessions.decision IS 'LLM router decision: initialize, reflect, enrich, continue';
 COMMENT ON COLUMN uploaded_files.storage_path IS 'Path in Supabase Storage (format: project_id/filename)';
+COMMENT ON COLUMN uploaded_files.content_hash IS 'SHA-256 of the file contents, so cached analysis follows the contents rather than the filename';
 COMMENT ON COLUMN uploaded_files.insights_cache IS 'Cached LLM-generated insights to avoid re-analysis of same file';
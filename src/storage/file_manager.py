@@ -2,11 +2,15 @@
 File manager for Supabase Storage integration
 """
 
+import hashlib
 import os
 from pathlib import Path
 from typing import Optional
 from ..database.client import get_db
 
+# Bytes read at a time when hashing a local file
+HASH_CHUNK_SIZE = 64 * 1024
+
 
 class FileManager:
     """Handle file uploads and downloads with Supabase Storage"""
@@ -83,6 +87,23 @@ class FileManager:
                 return storage_path
             raise Exception(f"Failed to upload file: {error_msg}")
 
+    @staticmethod
+    def hash_file(local_path: str) -> str:
+        """
+        Compute the SHA-256 of a local file's contents
+
+        Args:
+            local_path: Local file path
+
+        Returns:
+            Hex digest identifying the file's contents
+        """
+        digest = hashlib.sha256()
+        with open(local_path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
     @staticmethod
     def download_file(storage_path: str, local_dir: str = "/tmp") -> str:
         """
@@ -201,6 +222,19 @@ def upload_file(local_path: str, project_id: str) -> str:
     return FileManager.upload_file(local_path, project_id)
 
 
+def hash_file(local_path: str) -> str:
+    """
+    Convenience function to hash a local file's contents
+
+    Args:
+        local_path: Local file path
+
+    Returns:
+        SHA-256 hex digest
+    """
+    return FileManager.hash_file(local_path)
+
+
 def download_file(storage_path: str, local_dir: str = "/tmp") -> str:
     """
     Convenience function to download a file
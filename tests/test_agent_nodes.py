@@ -0,0 +1,432 @@
+"""
+Unit tests for agent node helpers (auto-save, file analysis, insight caching)
+"""
+
+import sys
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agent import nodes
+from src.agent.state import create_initial_state
+
+
+class TestAutoSave(unittest.TestCase):
+    """Test suite for background auto-saves"""
+
+    def setUp(self):
+        """Start each test without previously auto-saved fields"""
+        nodes._auto_saved_fields.clear()
+
+    def test_wait_for_auto_saves_waits_for_queued_write(self):
+        """Test a queued save has landed when wait_for_auto_saves returns"""
+        saved = []
+
+        def slow_save(project_data):
+            time.sleep(0.2)
+            saved.append(project_data["project_id"])
+
+        state = create_initial_state(project_id="proj-1", uploaded_files=[])
+        tracker = Mock()
+
+        with patch.object(nodes.ProjectPersistence, "save_project", side_effect=slow_save), \
+                patch.object(nodes, "get_progress_tracker", return_value=tracker):
+            nodes._queue_auto_save(state, "router")
+            nodes.wait_for_auto_saves()
+
+        self.assertEqual(saved, ["proj-1"])
+        tracker.log_message.assert_called_once_with("✓ Auto-saved state after router", "info")
+
+    def test_auto_save_status_logged_on_calling_thread(self):
+        """Test auto-save status lines are logged by the main thread"""
+        logging_threads = []
+        tracker = Mock()
+        tracker.log_message.side_effect = lambda *args: logging_threads.append(threading.current_thread())
+
+        state = create_initial_state(project_id="proj-2", uploaded_files=[])
+
+        with patch.object(nodes.ProjectPersistence, "save_project", side_effect=RuntimeError("db down")), \
+                patch.object(nodes, "get_progress_tracker", return_value=tracker):
+            nodes._queue_auto_save(state, "router")
+            nodes.wait_for_auto_saves()
+
+        self.assertEqual(logging_threads, [threading.current_thread()])
+        message, level = tracker.log_message.call_args[0]
+        self.assertIn("Auto-save failed: db down", message)
+        self.assertEqual(level, "warning")
+        # A failed write makes the next auto-save send every field
+        self.assertEqual(nodes._auto_saved_fields["proj-2"], {})
+
+    def test_fields_of_failed_save_are_sent_again(self):
+        """Test a save queued while an earlier save fails still re-sends its fields"""
+        release_failure = threading.Event()
+        calls = []
+        saved = []
+
+        def save(project_data):
+            calls.append(project_data)
+            if len(calls) == 1:
+                release_failure.wait(5)
+                raise RuntimeError("db down")
+            saved.append(set(project_data) - {"project_id"})
+
+        real_diff = nodes.ProjectPersistence.diff_project_fields
+
+        def diff_while_first_save_fails(project_data, saved_fields):
+            # Let the first write fail after the snapshot was read but
+            # before the new one is stored
+            result = real_diff(project_data, saved_fields)
+            release_failure.set()
+            nodes._pending_auto_saves[0][1].exception(5)
+            return result
+
+        state = create_initial_state(project_id="proj-7", uploaded_files=[])
+
+        with patch.object(nodes.ProjectPersistence, "save_project", side_effect=save), \
+                patch.object(nodes, "get_progress_tracker", return_value=Mock()):
+            nodes._queue_auto_save(state, "load_context")
+            failed_fields = set(
+                nodes.ProjectPersistence.diff_project_fields(
+                    nodes.state_to_project_dict(state, include_knowledge_facts=True), {}
+                )[0]
+            )
+
+            state["current_phase"] = "files_analyzed"
+            with patch.object(nodes.ProjectPersistence, "diff_project_fields",
+                              side_effect=diff_while_first_save_fails):
+                nodes._queue_auto_save(state, "analyze_files")
+            nodes.wait_for_auto_saves()
+
+            nodes._queue_auto_save(state, "data_collection")
+            nodes.wait_for_auto_saves()
+
+        self.assertEqual(saved[0], {"current_phase"})
+        self.assertEqual(saved[1], failed_fields)
+
+
+    def test_knowledge_facts_sent_again_after_retry_without_it(self):
+        """Test knowledge_facts dropped by the retry is not marked as saved"""
+        saved = []
+
+        def save(project_data):
+            if "knowledge_facts" in project_data and not saved:
+                raise RuntimeError("column projects.knowledge_facts does not exist")
+            saved.append(set(project_data) - {"project_id"})
+
+        state = create_initial_state(project_id="proj-8", uploaded_files=[])
+        state["knowledge_facts"] = {"product_description": {"value": "bottle", "confidence": 0.9}}
+        tracker = Mock()
+
+        with patch.object(nodes.ProjectPersistence, "save_project", side_effect=save), \
+                patch.object(nodes, "get_progress_tracker", return_value=tracker):
+            nodes._queue_auto_save(state, "discovery")
+            nodes.wait_for_auto_saves()
+            nodes._queue_auto_save(state, "data_collection")
+            nodes.wait_for_auto_saves()
+
+        self.assertNotIn("knowledge_facts", saved[0])
+        self.assertEqual(saved[1], {"knowledge_facts"})
+        tracker.log_message.assert_any_call(
+            "✓ Auto-saved state after discovery (without knowledge_facts)", "info"
+        )
+
+
+class TestLoadContext(unittest.TestCase):
+    """Test suite for load_context_node"""
+
+    def test_uses_project_preloaded_by_cli(self):
+        """Test the project row loaded by the CLI is not loaded again"""
+        state = create_initial_state(project_id="proj-3", uploaded_files=[])
+        state["preloaded_project"] = {"project_id": "proj-3", "current_phase": "strategy_built"}
+
+        with patch.object(nodes.ProjectPersistence, "load_project") as load_project, \
+                patch.object(nodes, "_queue_auto_save"):
+            result = nodes.load_context_node(state)
+
+        load_project.assert_not_called()
+        self.assertTrue(result["project_loaded"])
+        self.assertIsNone(result["preloaded_project"])
+
+    def test_loads_project_without_preloaded_row(self):
+        """Test the project is loaded from the database otherwise"""
+        state = create_initial_state(project_id="proj-4", uploaded_files=[])
+
+        with patch.object(nodes.ProjectPersistence, "load_project", return_value=None) as load_project, \
+                patch.object(nodes, "_queue_auto_save"):
+            result = nodes.load_context_node(state)
+
+        load_project.assert_called_once_with("proj-4")
+        self.assertFalse(result["project_loaded"])
+
+
+class FakeUploadedFilesTable:
+    """Stub Supabase query builder for a database without the content_hash column"""
+
+    MISSING_COLUMN = "column uploaded_files.content_hash does not exist"
+
+    def __init__(self, rows=None):
+        self.rows = list(rows or [])
+        self.filters = []
+        self.lookups = []
+        self.upserts = []
+        self.pending = None
+
+    def table(self, name):
+        return self
+
+    def select(self, *args):
+        self.filters = []
+        self.pending = "select"
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, value))
+        return self
+
+    def upsert(self, records, on_conflict=None):
+        self.pending = ("upsert", records)
+        return self
+
+    def execute(self):
+        if self.pending == "select":
+            columns = [column for column, _ in self.filters]
+            if "content_hash" in columns:
+                raise Exception(self.MISSING_COLUMN)
+            self.lookups.append(columns)
+            return Mock(data=[
+                row for row in self.rows
+                if all(row.get(column) == value for column, value in self.filters)
+            ])
+
+        records = self.pending[1]
+        if any("content_hash" in record for record in records):
+            raise Exception("Could not find the 'content_hash' column of 'uploaded_files'")
+        self.upserts.append(records)
+        return Mock(data=[{"file_id": str(i)} for i in range(len(records))])
+
+
+class TestAnalyzeFilesWithoutContentHashColumn(unittest.TestCase):
+    """Test suite for analyze_files_node on an unmigrated database"""
+
+    def _state(self):
+        """Build a state with one hashed upload"""
+        return create_initial_state(
+            project_id="proj-5",
+            uploaded_files=[{
+                "storage_path": "proj-5/data.csv",
+                "original_filename": "data.csv",
+                "content_hash": "abc123",
+            }]
+        )
+
+    def test_cached_record_found_by_storage_path(self):
+        """Test the file is looked up by path and its cached insights are kept"""
+        insights_cache = {
+            "strategy": {"insights": {"patterns": ["weekend CPA is lower"]}},
+            "generated_at": datetime.utcnow().isoformat(),
+            "strategy_version": nodes.INSIGHTS_CACHE_VERSION,
+        }
+        db = FakeUploadedFilesTable(rows=[{
+            "project_id": "proj-5",
+            "storage_path": "proj-5/data.csv",
+            "file_type": "historical",
+            "file_metadata": {"row_count": 2, "columns": ["spend"], "metrics": {}},
+            "insights_cache": insights_cache,
+        }])
+
+        with patch("src.database.file_persistence.get_db", return_value=db), \
+                patch.object(nodes, "download_file") as download_file, \
+                patch.object(nodes, "_queue_auto_save"):
+            result = nodes.analyze_files_node(self._state())
+
+        self.assertEqual(result["errors"], [])
+        self.assertIn(["project_id", "storage_path"], db.lookups)
+        download_file.assert_not_called()
+        self.assertTrue(result["file_analyses"][0]["cached"])
+        self.assertEqual(result["file_analyses"][0]["insights_cache"], insights_cache)
+        # Nothing is written back, so the stored insights_cache survives
+        self.assertEqual(db.upserts, [])
+        self.assertEqual(db.rows[0]["insights_cache"], insights_cache)
+
+    def test_new_file_analyzed_and_upsert_retried(self):
+        """Test a new file is analyzed and saved without the content_hash column"""
+        db = FakeUploadedFilesTable()
+        analysis = {"type": "historical", "row_count": 2, "columns": ["spend"], "metrics": {}, "data": [{}]}
+
+        with patch("src.database.file_persistence.get_db", return_value=db), \
+                patch.object(nodes, "download_file", return_value="/tmp/data.csv"), \
+                patch.object(nodes.DataLoader, "analyze_file", return_value=analysis), \
+                patch.object(nodes, "_queue_auto_save"):
+            result = nodes.analyze_files_node(self._state())
+
+        self.assertEqual(result["errors"], [])
+        self.assertIn(["project_id", "storage_path"], db.lookups)
+        self.assertEqual(len(result["file_analyses"]), 1)
+        self.assertFalse(result["file_analyses"][0]["cached"])
+        self.assertEqual(len(db.upserts), 1)
+        self.assertEqual(db.upserts[0][0]["storage_path"], "proj-5/data.csv")
+        self.assertNotIn("content_hash", db.upserts[0][0])
+
+
+class TestDataCollectionBenchmarks(unittest.TestCase):
+    """Test suite for the market benchmarks search in data_collection_node"""
+
+    def _state(self, **knowledge_facts):
+        """Build a state whose knowledge_facts and user_inputs describe the product differently"""
+        state = create_initial_state(project_id="proj-6", uploaded_files=[])
+        state["knowledge_facts"] = {
+            "product_description": {"value": "refillable steel water bottle", "confidence": 0.9},
+            **knowledge_facts,
+        }
+        state["user_inputs"] = {"product_description": "water bottle"}
+        return state
+
+    def test_search_query_matches_query_sent(self):
+        """Test the recorded search_query is the query sent to Tavily"""
+        tavily = Mock()
+        tavily.search.return_value = {"results": [{"title": "benchmarks"}]}
+
+        with patch.dict("os.environ", {"TAVILY_API_KEY": "key"}), \
+                patch.object(nodes, "get_tavily", return_value=tavily), \
+                patch.object(nodes, "_queue_auto_save"):
+            result = nodes.data_collection_node(self._state())
+
+        sent_query = tavily.search.call_args.kwargs["query"]
+        expected = nodes.WEB_SEARCH_QUERIES["benchmarks"].format(product="refillable steel water bottle")
+        self.assertEqual(sent_query, expected)
+        self.assertEqual(result["market_data"]["benchmarks"]["search_query"], sent_query)
+
+    def test_reused_benchmarks_record_discovery_query(self):
+        """Test reused discovery results record the query discovery sent"""
+        tavily = Mock()
+        tavily.search.return_value = {"results": [{"title": "benchmarks"}]}
+        state = self._state()
+
+        with patch.dict("os.environ", {"TAVILY_API_KEY": "key"}), \
+                patch.object(nodes, "get_tavily", return_value=tavily):
+            state["knowledge_facts"].update(nodes.parallel_web_search(state))
+            discovery_queries = [call.args[0] for call in tavily.search.call_args_list]
+            tavily.search.reset_mock()
+            with patch.object(nodes, "_queue_auto_save"):
+                result = nodes.data_collection_node(state)
+
+        tavily.search.assert_not_called()
+        self.assertIn(result["market_data"]["benchmarks"]["search_query"], discovery_queries)
+
+
+class TestInsightsCacheIsCurrent(unittest.TestCase):
+    """Test suite for cached insights expiry"""
+
+    def _cache(self, age, **overrides):
+        """Build an insights cache generated the given timedelta ago"""
+        cache = {
+            "strategy": {"insights": {}},
+            "generated_at": (datetime.utcnow() - age).isoformat(),
+            "strategy_version": nodes.INSIGHTS_CACHE_VERSION,
+        }
+        cache.update(overrides)
+        return cache
+
+    def test_fresh_cache_is_current(self):
+        """Test insights generated within the TTL are reused"""
+        self.assertTrue(nodes._insights_cache_is_current(self._cache(timedelta(hours=1))))
+
+    def test_expired_cache(self):
+        """Test insights older than the TTL are regenerated"""
+        ttl = timedelta(days=nodes.INSIGHTS_CACHE_TTL_DAYS)
+        self.assertTrue(nodes._insights_cache_is_current(self._cache(ttl - timedelta(minutes=1))))
+        self.assertFalse(nodes._insights_cache_is_current(self._cache(ttl + timedelta(minutes=1))))
+
+    def test_version_mismatch(self):
+        """Test insights from another or no cache version are regenerated"""
+        fresh = timedelta(hours=1)
+        self.assertFalse(nodes._insights_cache_is_current(self._cache(fresh, strategy_version="0")))
+
+        cache = self._cache(fresh)
+        del cache["strategy_version"]
+        self.assertFalse(nodes._insights_cache_is_current(cache))
+
+    def test_missing_or_invalid_timestamp(self):
+        """Test insights without a parseable generated_at are regenerated"""
+        cache = self._cache(timedelta(hours=1))
+        del cache["generated_at"]
+        self.assertFalse(nodes._insights_cache_is_current(cache))
+
+        for generated_at in (None, "", "yesterday", 1700000000):
+            with self.subTest(generated_at=generated_at):
+                cache = self._cache(timedelta(hours=1), generated_at=generated_at)
+                self.assertFalse(nodes._insights_cache_is_current(cache))
+
+    def test_offset_aware_timestamp(self):
+        """Test a generated_at with a UTC offset is compared in UTC"""
+        generated_at = datetime.now(timezone(timedelta(hours=-5))) - timedelta(hours=1)
+        cache = self._cache(timedelta(0), generated_at=generated_at.isoformat())
+        self.assertTrue(nodes._insights_cache_is_current(cache))
+
+        expired = generated_at - timedelta(days=nodes.INSIGHTS_CACHE_TTL_DAYS)
+        cache = self._cache(timedelta(0), generated_at=expired.isoformat())
+        self.assertFalse(nodes._insights_cache_is_current(cache))
+
+
+class TestExtractCachedContext(unittest.TestCase):
+    """Test suite for the cached insights context passed to the LLM"""
+
+    def _file(self, name, insights):
+        """Build a cached file analysis carrying the given strategy insights"""
+        return {"file_name": name, "insights_cache": {"strategy": {"insights": insights}}}
+
+    def test_no_cached_files(self):
+        """Test the placeholder is returned without cached insights"""
+        self.assertEqual(nodes.extract_cached_context([]), "No previous insights available")
+        self.assertEqual(
+            nodes.extract_cached_context([{"file_name": "a.csv", "insights_cache": {}}]),
+            "No previous insights available",
+        )
+
+    def test_duplicate_insights_listed_once_in_first_file_order(self):
+        """Test insights shared by several files are listed once, under the first file"""
+        shared = {"patterns": ["p1"], "strengths": ["s1"], "weaknesses": ["w1"]}
+        other = {"patterns": ["p2"], "strengths": [], "weaknesses": []}
+        cached_files = [
+            self._file("a.csv", shared),
+            self._file("b.csv", other),
+            # Same insights with keys in another order
+            self._file("c.csv", {"weaknesses": ["w1"], "strengths": ["s1"], "patterns": ["p1"]}),
+        ]
+
+        context = nodes.extract_cached_context(cached_files)
+
+        headers = [line for line in context.splitlines() if line.startswith("Previous insights from")]
+        self.assertEqual(headers, ["Previous insights from a.csv:", "Previous insights from b.csv:"])
+
+    def test_items_capped_per_category(self):
+        """Test each category lists at most CACHED_CONTEXT_MAX_ITEMS items"""
+        count = nodes.CACHED_CONTEXT_MAX_ITEMS + 3
+        insights = {
+            "patterns": [f"p{i}" for i in range(count)],
+            "strengths": [f"s{i}" for i in range(count)],
+            "weaknesses": ["w0"],
+        }
+
+        lines = nodes.extract_cached_context([self._file("a.csv", insights)]).splitlines()
+
+        capped = [f"p{i}" for i in range(nodes.CACHED_CONTEXT_MAX_ITEMS)]
+        self.assertEqual(lines[1], f"- Patterns: {capped}")
+        self.assertEqual(lines[2], f"- Strengths: {[s.replace('p', 's') for s in capped]}")
+        self.assertEqual(lines[3], "- Weaknesses: ['w0']")
+
+    def test_custom_limit(self):
+        """Test the limit argument overrides the default cap"""
+        insights = {"patterns": ["p0", "p1", "p2"], "strengths": [], "weaknesses": []}
+        context = nodes.extract_cached_context([self._file("a.csv", insights)], limit=2)
+        self.assertIn("- Patterns: ['p0', 'p1']", context)
+
+
+if __name__ == "__main__":
+    unittest.main()
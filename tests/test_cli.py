@@ -0,0 +1,266 @@
+"""
+Unit tests for CLI helpers and the run command output
+"""
+
+import io
+import json
+import sys
+import tempfile
+import unittest
+import uuid
+from contextlib import redirect_stdout
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import cli
+
+
+class TestIsUuid(unittest.TestCase):
+    """Test suite for project UUID detection"""
+
+    UUID = "3f2b8c1e-9a4d-4e6f-8b7a-1c2d3e4f5a6b"
+
+    def test_canonical(self):
+        """Test canonical lowercase and uppercase UUIDs"""
+        self.assertTrue(cli._is_uuid(self.UUID))
+        self.assertTrue(cli._is_uuid(self.UUID.upper()))
+
+    def test_other_spellings(self):
+        """Test the other spellings uuid.UUID accepts"""
+        hex_only = self.UUID.replace("-", "")
+        for value in (
+            hex_only,
+            hex_only.upper(),
+            "{" + self.UUID + "}",
+            "{" + self.UUID.upper() + "}",
+            "{" + hex_only + "}",
+            "urn:uuid:" + self.UUID,
+            "urn:uuid:" + hex_only,
+        ):
+            with self.subTest(value=value):
+                self.assertTrue(cli._is_uuid(value))
+
+    def test_invalid(self):
+        """Test project names and malformed UUIDs are not UUIDs"""
+        for value in (
+            "my-campaign",
+            "",
+            self.UUID[:-1],
+            self.UUID + "0",
+            self.UUID[:-1] + "g",
+            self.UUID.replace("-", "_"),
+            "{" + self.UUID[:-1] + "g}",
+            "urn:uuid:" + self.UUID[:-1] + "g",
+            "x" * 36,
+            "-" * 36,
+        ):
+            with self.subTest(value=value):
+                self.assertFalse(cli._is_uuid(value))
+
+    def test_non_string(self):
+        """Test non-string values are not UUIDs"""
+        self.assertFalse(cli._is_uuid(None))
+        self.assertFalse(cli._is_uuid(uuid.UUID(self.UUID)))
+
+
+class TestFindMissingFiles(unittest.TestCase):
+    """Test suite for input file validation"""
+
+    def setUp(self):
+        """Create a directory holding two files"""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.dir = Path(self._tmp.name)
+        for name in ("a.csv", "b.csv"):
+            (self.dir / name).write_text("spend\n1\n")
+
+    def test_all_present(self):
+        """Test nothing is reported when every file exists"""
+        paths = [self.dir / "a.csv", self.dir / "b.csv"]
+        self.assertEqual(cli._find_missing_files(paths), [])
+
+    def test_missing_in_input_order(self):
+        """Test missing files are reported in the order they were given"""
+        paths = [
+            self.dir / "z.csv",
+            self.dir / "a.csv",
+            self.dir / "missing" / "c.csv",
+            self.dir / "b.csv",
+            self.dir / "y.csv",
+        ]
+        self.assertEqual(
+            cli._find_missing_files(paths),
+            [self.dir / "z.csv", self.dir / "missing" / "c.csv", self.dir / "y.csv"],
+        )
+
+    def test_single_file_directories(self):
+        """Test files alone in their directory are checked directly"""
+        present = self.dir / "a.csv"
+        missing = self.dir / "missing" / "a.csv"
+        self.assertEqual(cli._find_missing_files([present]), [])
+        self.assertEqual(cli._find_missing_files([missing, present]), [missing])
+
+    def test_broken_symlink_is_missing(self):
+        """Test a symlink to a missing file is reported next to existing files"""
+        broken = self.dir / "broken.csv"
+        broken.symlink_to(self.dir / "deleted.csv")
+        linked = self.dir / "linked.csv"
+        linked.symlink_to(self.dir / "a.csv")
+
+        paths = [self.dir / "a.csv", broken, linked]
+        self.assertEqual(cli._find_missing_files(paths), [broken])
+        self.assertEqual(cli._find_missing_files([broken]), [broken])
+
+    def test_unreadable_directory_listing(self):
+        """Test a failed directory listing falls back to per-file checks"""
+        paths = [self.dir / "a.csv", self.dir / "z.csv"]
+        with patch.object(cli.os, "scandir", side_effect=PermissionError("denied")):
+            self.assertEqual(cli._find_missing_files(paths), [self.dir / "z.csv"])
+
+
+class TestRunCommandJson(unittest.TestCase):
+    """Test suite for `run --json` output"""
+
+    def test_json_is_last_line(self):
+        """Test the JSON results are printed after the completion banner"""
+        final_state = {
+            "project_id": "proj-1",
+            "session_num": 1,
+            "iteration": 0,
+            "current_config": {"meta": {}},
+            "errors": [],
+        }
+        agent = Mock()
+        agent.invoke.return_value = final_state
+        modules = {
+            "src.agent.graph": Mock(get_campaign_agent=Mock(return_value=agent)),
+            "src.database.persistence": Mock(
+                SessionPersistence=Mock(create_session=Mock(return_value="session-1"))
+            ),
+            "src.storage.file_manager": Mock(),
+        }
+        args = SimpleNamespace(project_id="my-campaign", restart=False, json=True)
+
+        out = io.StringIO()
+        with patch.dict(sys.modules, modules), \
+                patch.object(cli, "get_or_create_project", return_value=("proj-1", None)), \
+                patch.object(cli, "_save_config", return_value="campaign_proj-1_v0.json"), \
+                patch("builtins.input", return_value="https://example.com/product"), \
+                redirect_stdout(out):
+            exit_code = cli.run_command(args)
+
+        self.assertEqual(exit_code, 0)
+        last_line = out.getvalue().rstrip("\n").splitlines()[-1]
+        results = json.loads(last_line)
+        self.assertEqual(results["project_id"], "proj-1")
+        self.assertEqual(results["config_file"], "campaign_proj-1_v0.json")
+
+
+class TestFormatBudgetShare(unittest.TestCase):
+    """Test suite for budget_split percentage formatting"""
+
+    def test_numbers(self):
+        """Test numeric fractions are shown as percentages"""
+        self.assertEqual(cli._format_budget_share(0.4), "40%")
+        self.assertEqual(cli._format_budget_share(1), "100%")
+
+    def test_numeric_strings(self):
+        """Test every string float() accepts is shown as a percentage"""
+        cases = {
+            "0.4": "40%",
+            "-0.2": "-20%",
+            "1e-1": "10%",
+            ".5": "50%",
+            "+0.4": "40%",
+            " 0.6": "60%",
+        }
+        for value, expected in cases.items():
+            with self.subTest(value=value):
+                self.assertEqual(cli._format_budget_share(value), expected)
+
+    def test_non_numeric_passed_through(self):
+        """Test values that are not numbers are shown unchanged"""
+        self.assertEqual(cli._format_budget_share("40%"), "40%")
+        self.assertEqual(cli._format_budget_share("majority"), "majority")
+        self.assertEqual(cli._format_budget_share(None), "None")
+
+
+class TestRunCommandUploads(unittest.TestCase):
+    """Test suite for file validation before uploading"""
+
+    def test_duplicate_file_names_rejected(self):
+        """Test files sharing a name are rejected before any upload"""
+        file_manager = Mock()
+        modules = {
+            "src.agent.graph": Mock(),
+            "src.database.persistence": Mock(),
+            "src.storage.file_manager": file_manager,
+        }
+        args = SimpleNamespace(project_id="my-campaign", restart=False, json=False)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [Path(tmp, "a", "data.csv"), Path(tmp, "b", "data.csv")]
+            for path in paths:
+                path.parent.mkdir()
+                path.write_text("spend\n1\n")
+
+            out = io.StringIO()
+            with patch.dict(sys.modules, modules), \
+                    patch.object(cli, "get_or_create_project", return_value=("proj-1", None)), \
+                    patch("builtins.input", return_value=",".join(str(p) for p in paths)), \
+                    redirect_stdout(out):
+                exit_code = cli.run_command(args)
+
+        self.assertEqual(exit_code, 1)
+        self.assertIn("Error: Multiple files named data.csv", out.getvalue())
+        file_manager.upload_file.assert_not_called()
+
+    def test_find_duplicate_names(self):
+        """Test only file names given more than once are reported, with their paths"""
+        paths = [Path("a/data.csv"), Path("b/data.csv"), Path("a/other.csv")]
+        self.assertEqual(
+            cli._find_duplicate_names(paths),
+            {"data.csv": [Path("a/data.csv"), Path("b/data.csv")]},
+        )
+        self.assertEqual(cli._find_duplicate_names([Path("a/data.csv"), Path("a/other.csv")]), {})
+
+
+class TestManualChecklist(unittest.TestCase):
+    """Test suite for the manual setup checklist"""
+
+    def _format_line(self, creative_specs):
+        """Render a checklist and return its creative format line"""
+        config = {"meta": {"campaign_name": "Test", "creative_specs": creative_specs}}
+        out = io.StringIO()
+        cli.write_manual_checklist(config, out)
+        return next(line for line in out.getvalue().splitlines() if line.startswith("- [ ] Format:"))
+
+    def test_formats_none(self):
+        """Test a null formats value falls back to the default"""
+        self.assertEqual(self._format_line({"formats": None}), "- [ ] Format: Video or Image")
+
+    def test_formats_missing(self):
+        """Test missing formats fall back to the default"""
+        self.assertEqual(self._format_line({"duration": "15s"}), "- [ ] Format: Video or Image")
+
+    def test_formats_scalar(self):
+        """Test a bare string format is not split into characters"""
+        self.assertEqual(self._format_line({"formats": "Video"}), "- [ ] Format: Video")
+
+    def test_formats_list(self):
+        """Test listed formats are joined"""
+        self.assertEqual(self._format_line({"formats": ["Video", "Image"]}), "- [ ] Format: Video, Image")
+
+    def test_config_not_mutated(self):
+        """Test rendering leaves the caller's config untouched"""
+        config = {"meta": {"creative_specs": {"formats": "Video"}}}
+        cli.write_manual_checklist(config, io.StringIO())
+        self.assertEqual(config, {"meta": {"creative_specs": {"formats": "Video"}}})
+
+
+if __name__ == "__main__":
+    unittest.main()
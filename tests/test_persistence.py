@@ -0,0 +1,97 @@
+"""
+Unit tests for project persistence helpers
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.database.persistence import ProjectPersistence
+
+
+class TestDiffProjectFields(unittest.TestCase):
+    """Test suite for ProjectPersistence.diff_project_fields"""
+
+    def _project(self):
+        """Build a project row with scalar, list and nested dict fields"""
+        return {
+            "project_id": "proj-1",
+            "current_phase": "strategy_built",
+            "iteration": 1,
+            "uploaded_files": [{"storage_path": "proj-1/data.csv"}],
+            "current_strategy": {"platforms": {"meta": 0.6, "tiktok": 0.4}, "notes": None},
+        }
+
+    def test_first_save_sends_every_field(self):
+        """Test every field except project_id changes when nothing was saved"""
+        changed, saved = ProjectPersistence.diff_project_fields(self._project(), {})
+
+        expected = self._project()
+        del expected["project_id"]
+        self.assertEqual(changed, expected)
+        self.assertEqual(set(saved), set(expected))
+
+    def test_unchanged_project_sends_nothing(self):
+        """Test a project equal to the previous save has no changed fields"""
+        _, saved = ProjectPersistence.diff_project_fields(self._project(), {})
+        changed, saved_again = ProjectPersistence.diff_project_fields(self._project(), saved)
+
+        self.assertEqual(changed, {})
+        self.assertEqual(saved_again, saved)
+
+    def test_only_changed_fields_sent(self):
+        """Test only modified fields are returned"""
+        _, saved = ProjectPersistence.diff_project_fields(self._project(), {})
+        project = self._project()
+        project["current_phase"] = "campaign_generated"
+        project["uploaded_files"].append({"storage_path": "proj-1/more.csv"})
+
+        changed, _ = ProjectPersistence.diff_project_fields(project, saved)
+
+        self.assertEqual(set(changed), {"current_phase", "uploaded_files"})
+        self.assertEqual(changed["uploaded_files"], project["uploaded_files"])
+
+    def test_nested_dict_equality_ignores_key_order(self):
+        """Test equal nested dicts built in another key order are unchanged"""
+        _, saved = ProjectPersistence.diff_project_fields(self._project(), {})
+        project = self._project()
+        project["current_strategy"] = {"notes": None, "platforms": {"tiktok": 0.4, "meta": 0.6}}
+
+        changed, _ = ProjectPersistence.diff_project_fields(project, saved)
+
+        self.assertEqual(changed, {})
+
+    def test_nested_value_change_detected(self):
+        """Test a change deep inside a nested dict marks the field changed"""
+        _, saved = ProjectPersistence.diff_project_fields(self._project(), {})
+        project = self._project()
+        project["current_strategy"]["platforms"]["meta"] = 0.7
+
+        changed, _ = ProjectPersistence.diff_project_fields(project, saved)
+
+        self.assertEqual(changed, {"current_strategy": project["current_strategy"]})
+
+    def test_in_place_mutation_detected(self):
+        """Test mutating the same dict after a save is still detected"""
+        project = self._project()
+        _, saved = ProjectPersistence.diff_project_fields(project, {})
+        project["current_strategy"]["notes"] = "shift budget to meta"
+
+        changed, _ = ProjectPersistence.diff_project_fields(project, saved)
+
+        self.assertEqual(set(changed), {"current_strategy"})
+
+    def test_changed_values_are_detached_copies(self):
+        """Test changed values don't share objects with the caller's state"""
+        project = self._project()
+        changed, _ = ProjectPersistence.diff_project_fields(project, {})
+        project["current_strategy"]["platforms"]["meta"] = 0.9
+
+        self.assertEqual(changed["current_strategy"]["platforms"]["meta"], 0.6)
+
+
+if __name__ == "__main__":
+    unittest.main()